@@ -0,0 +1,285 @@
+import os
+import json
+import struct
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from channelset import ChannelSet, search_time, uniform_time_base
+
+
+# Binary cache layout (one file per source file):
+#   magic (4 bytes) | header length (uint32) | JSON header | padding | data block
+# The data block is a C-ordered (num_columns, num_rows) float array, so every
+# column of the source file (Time first, then the channels) is one contiguous
+# run of samples that can be memory-mapped on its own.
+CACHE_MAGIC = b"VCH1"
+CACHE_VERSION = 2
+CACHE_DIR = ".vibcache"
+CACHE_ALIGN = 64
+
+# Files with more columns than this are opened lazily, column by column
+LAZY_COLUMNS = 32
+
+# Upper bound on lazily loaded channel columns kept in memory at once
+MAX_RESIDENT_COLUMNS = 32
+
+# Bytes read from the head and tail of the source file for the content hash
+HASH_BLOCK = 1 << 20
+
+
+def source_signature(file_path):
+    # Size and mtime catch ordinary edits; the hash of the first and last
+    # block catches files that were replaced with the same size and mtime.
+    stat = os.stat(file_path)
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        digest.update(f.read(HASH_BLOCK))
+        if stat.st_size > HASH_BLOCK:
+            f.seek(max(stat.st_size - HASH_BLOCK, HASH_BLOCK))
+            digest.update(f.read(HASH_BLOCK))
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": digest.hexdigest()}
+
+
+def cache_path_for(file_path, dtype=np.float64):
+    # One cache per storage precision, e.g. data.csv.f8.vcache / data.csv.f4.vcache
+    folder, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(folder, CACHE_DIR, "{}.{}.vcache".format(name, np.dtype(dtype).str[1:]))
+
+
+def read_header(cache_path):
+    with open(cache_path, "rb") as f:
+        if f.read(4) != CACHE_MAGIC:
+            return None
+        (length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(length).decode("utf-8"))
+    header["offset"] = 8 + length
+    return header
+
+
+def write_cache(cache_path, columns, block, source, dtype=np.float64):
+    # block has shape (num_columns, num_rows); written to a temporary file
+    # first so a reader never sees a half-written cache. The time base is
+    # taken from the full-precision Time row before any cast to dtype.
+    t0, dt, uniform = uniform_time_base(block[0])
+    block = np.ascontiguousarray(block, dtype=dtype)
+    header = {
+        "version": CACHE_VERSION,
+        "columns": [str(c) for c in columns],
+        "num_rows": int(block.shape[1]),
+        "dtype": block.dtype.str,
+        "fs": 1.0 / dt,
+        "t0": t0,
+        "dt": dt,
+        "uniform": uniform,
+        "source": source,
+    }
+    raw = json.dumps(header).encode("utf-8")
+    # Pad the header with spaces so the data block starts on an aligned offset
+    raw = raw.ljust(len(raw) + (-(8 + len(raw)) % CACHE_ALIGN))
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(CACHE_MAGIC)
+        f.write(struct.pack("<I", len(raw)))
+        f.write(raw)
+        block.tofile(f)
+    os.replace(tmp_path, cache_path)
+    return header
+
+
+def open_cache(file_path, dtype=np.float64):
+    # Returns (header, memmap block) when a cache exists and still matches the
+    # source file, otherwise None.
+    cache_path = cache_path_for(file_path, dtype)
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        header = read_header(cache_path)
+    except (OSError, ValueError, struct.error):
+        return None
+    if header is None or header.get("version") != CACHE_VERSION:
+        return None
+    if header["source"] != source_signature(file_path):
+        return None
+    shape = (len(header["columns"]), header["num_rows"])
+    block = np.memmap(cache_path, dtype=np.dtype(header["dtype"]), mode="r",
+                      offset=header["offset"], shape=shape)
+    return header, block
+
+
+def cached_block(file_path, parse, dtype=np.float64):
+    # parse(file_path) -> DataFrame is only called when the cache is missing or
+    # stale; its result is converted into the cache and served from the memmap.
+    # A float32 cache is derived from a valid float64 cache without re-parsing.
+    # Returns (columns, block, (t0, dt, uniform)).
+    cached = open_cache(file_path, dtype)
+    if cached is None:
+        source = source_signature(file_path)
+        full = open_cache(file_path) if np.dtype(dtype) != np.float64 else None
+        if full is not None:
+            columns, block = full[0]["columns"], full[1]
+        else:
+            data = parse(file_path)
+            columns = [str(c) for c in data.columns]
+            # Raises ValueError for non-numeric columns, which cannot be plotted either
+            block = data.to_numpy(dtype=np.float64).T
+        try:
+            write_cache(cache_path_for(file_path, dtype), columns, block, source, dtype)
+        except OSError:
+            time_base = uniform_time_base(block[0])
+            return columns, np.ascontiguousarray(block, dtype=dtype), time_base
+        cached = open_cache(file_path, dtype)
+    header, block = cached
+    return header["columns"], block, (header["t0"], header["dt"], header["uniform"])
+
+
+def load_cached(file_path, parse):
+    # Transposing the (columns, rows) block gives a column-major view that
+    # pandas wraps without copying, so only the pages that are read get loaded.
+    columns, block, time_base = cached_block(file_path, parse)
+    return pd.DataFrame(block.T, columns=columns, copy=False)
+
+
+def read_header_columns(file_path):
+    if file_path.endswith('.xlsx'):
+        return [str(c) for c in pd.read_excel(file_path, nrows=0).columns]
+    return [str(c) for c in pd.read_csv(file_path, nrows=0).columns]
+
+
+def load_columns(file_path, parse, max_resident=MAX_RESIDENT_COLUMNS, dtype=np.float64, lazy_parse=None):
+    # Wide files without a cache are opened lazily from their header and
+    # converted into the binary cache in the background; anything else is
+    # parsed once into the cache right away. Cached files are served from the
+    # memmap as a ChannelSet whose channel rows are views of the mapped block.
+    # lazy_parse (default parse) reads the columns of a lazily opened file
+    # later on, after loading has finished.
+    if open_cache(file_path, dtype) is None and open_cache(file_path) is None:
+        columns = read_header_columns(file_path)
+        if len(columns) > LAZY_COLUMNS:
+            lazy = LazyChannels(file_path, columns, lazy_parse or parse, max_resident, dtype)
+            lazy.cache_in_background()
+            return lazy
+    return ChannelSet.from_columns(*cached_block(file_path, parse, dtype))
+
+
+class LazyChannels:
+    # Only the header is read at open time. The whole file is converted into
+    # the binary cache once, on a background thread (cache_in_background);
+    # from then on every read is served from the memmap. Until then channel
+    # columns are parsed on demand with parse(file_path, usecols=[...]) and
+    # kept in an LRU of at most max_resident channels; the Time column is
+    # kept once read, always in float64. Offers the same channel access
+    # methods as ChannelSet and
+    # may be used from background threads: files are parsed outside the
+    # lock, which is only held to look up and update the resident columns,
+    # so a slow read on one thread never blocks the others.
+    def __init__(self, file_path, columns, parse, max_resident=MAX_RESIDENT_COLUMNS, dtype=np.float64):
+        self.file_path = file_path
+        self.dtype = np.dtype(dtype)
+        self.names = list(columns[1:])
+        self.parse = parse
+        self.max_resident = max_resident
+        self.resident = OrderedDict()
+        self.time_values = None
+        self.lock = threading.RLock()
+        # ChannelSet over the binary cache once it has been written
+        self.cached = None
+        self.cache_thread = None
+
+    def cache_in_background(self):
+        self.cache_thread = threading.Thread(target=self.build_cache, daemon=True)
+        self.cache_thread.start()
+
+    def build_cache(self):
+        # One full parse into the cache; if it fails, columns simply keep
+        # being parsed on demand
+        try:
+            cached = ChannelSet.from_columns(*cached_block(self.file_path, self.parse, self.dtype))
+        except Exception:
+            return
+        with self.lock:
+            self.cached = cached
+            self.resident.clear()
+
+    @property
+    def num_channels(self):
+        return len(self.names)
+
+    @property
+    def num_samples(self):
+        if self.cached is not None:
+            return self.cached.num_samples
+        return len(self.time())
+
+    def __len__(self):
+        return self.num_samples
+
+    def time(self, start=0, stop=None):
+        if self.cached is not None:
+            return self.cached.time(start, stop)
+        if self.time_values is None:
+            self.prefetch([], time=True)
+        return self.time_values[start:stop]
+
+    def time_at(self, indices):
+        if self.cached is not None:
+            return self.cached.time_at(indices)
+        return self.time()[indices]
+
+    def sample_range(self, start_time, stop_time):
+        if self.cached is not None:
+            return self.cached.sample_range(start_time, stop_time)
+        return search_time(self.time(), start_time, stop_time)
+
+    def channel(self, index):
+        if self.cached is not None:
+            return self.cached.channel(index)
+        return self.read([index])[index]
+
+    def channels(self, indices, keep=True):
+        # keep=False is for one-off passes over many channels (run off the
+        # Tk thread): they wait for the cache conversion instead of parsing
+        # the file again, and without a cache they leave the LRU, and so the
+        # pages on screen, as it is
+        if not keep and self.cache_thread is not None:
+            self.cache_thread.join()
+        if self.cached is not None:
+            return self.cached.channels(indices)
+        indices = list(indices)
+        values = self.read(indices, keep=keep)
+        return np.stack([values[index] for index in indices])
+
+    def prefetch(self, indices, time=False):
+        if self.cached is None:
+            self.read(indices, time)
+
+    def read(self, indices, time=False, keep=True):
+        # {index: samples} for the given channels. Every one not resident is
+        # parsed in one pass, then kept in the LRU (the last max_resident of
+        # them) unless keep is False; the values are returned directly, so a
+        # column evicted by another thread in the meantime is not parsed again.
+        indices = list(indices)
+        with self.lock:
+            values = {index: self.resident[index] for index in indices if index in self.resident}
+            read_time = time and self.time_values is None
+        missing = sorted({index + 1 for index in indices if index not in values} | ({0} if read_time else set()))
+        time_values = None
+        if missing:
+            data = self.parse(self.file_path, usecols=missing)
+            for column, name in zip(missing, data.columns):
+                if column == 0:
+                    time_values = data[name].to_numpy(dtype=np.float64)
+                else:
+                    values[column - 1] = data[name].to_numpy(dtype=self.dtype)
+        with self.lock:
+            if time_values is not None and self.time_values is None:
+                self.time_values = time_values
+            for index in indices[-self.max_resident:] if keep else []:
+                self.resident[index] = values[index]
+                self.resident.move_to_end(index)
+            while len(self.resident) > self.max_resident:
+                self.resident.popitem(last=False)
+        return values
@@ -0,0 +1,142 @@
+import numpy as np
+from spectral import batched_welch
+
+
+class ChannelSet:
+    # Array-backed container for a multi-channel acquisition.
+    #
+    # All channels live in one (num_channels, num_samples) block, so every
+    # channel is a contiguous row and channel(i) is a view, never a copy. A
+    # uniform time base is kept as (t0, dt); only irregular time columns are
+    # stored in full.
+    def __init__(self, names, block, t0=0.0, dt=1.0, time=None):
+        self.names = [str(name) for name in names]
+        self.block = block
+        self.t0 = float(t0)
+        self.dt = float(dt)
+        self.time_values = time
+
+    @classmethod
+    def from_columns(cls, columns, block, time_base=None):
+        # columns/block as stored in the binary cache: Time first, then the
+        # channels. The channel rows are taken as a view of block.
+        if time_base is None:
+            time_base = uniform_time_base(block[0])
+        t0, dt, uniform = time_base
+        return cls(columns[1:], block[1:], t0, dt, time=None if uniform else np.asarray(block[0]))
+
+    @property
+    def num_channels(self):
+        return len(self.names)
+
+    @property
+    def num_samples(self):
+        return self.block.shape[1]
+
+    @property
+    def fs(self):
+        return 1.0 / self.dt
+
+    @property
+    def dtype(self):
+        return self.block.dtype
+
+    def __len__(self):
+        return self.num_samples
+
+    def __getitem__(self, name):
+        return self.block[self.names.index(name)]
+
+    def time(self, start=0, stop=None):
+        stop = self.num_samples if stop is None else stop
+        if self.time_values is not None:
+            return self.time_values[start:stop]
+        return self.t0 + self.dt * np.arange(start, stop, dtype=np.float64)
+
+    def time_at(self, indices):
+        # Time of the given sample indices (any shape)
+        if self.time_values is not None:
+            return self.time_values[indices]
+        return self.t0 + self.dt * np.asarray(indices, dtype=np.float64)
+
+    def sample_range(self, start_time, stop_time):
+        # [start, stop) slice of the samples covering a time window, with one
+        # extra sample on each side so a trace reaches the window edges
+        if self.time_values is not None:
+            return search_time(self.time_values, start_time, stop_time)
+        start = int(np.floor((start_time - self.t0) / self.dt))
+        stop = int(np.ceil((stop_time - self.t0) / self.dt)) + 1
+        return min(max(start, 0), self.num_samples), min(max(stop, 0), self.num_samples)
+
+    def channel(self, index):
+        return self.block[index]
+
+    def channels(self, indices, keep=True):
+        # A run of consecutive channels is a view; anything else is gathered.
+        # keep is for parity with LazyChannels.
+        indices = list(indices)
+        if indices and indices == list(range(indices[0], indices[-1] + 1)):
+            return self.block[indices[0]:indices[-1] + 1]
+        return self.block[indices]
+
+    def prefetch(self, indices, time=False):
+        # Everything is already addressable; kept for parity with LazyChannels
+        pass
+
+
+def search_time(time_values, start_time, stop_time):
+    # sample_range for an explicit, increasing time column
+    start = max(int(np.searchsorted(time_values, start_time, side="right")) - 1, 0)
+    stop = min(int(np.searchsorted(time_values, stop_time, side="left")) + 1, len(time_values))
+    return start, max(stop, start)
+
+
+def uniform_time_base(time_values, tolerance=1e-3):
+    # (t0, dt, uniform): uniform when every sample lies within tolerance * dt
+    # of t0 + i * dt
+    n = len(time_values)
+    if n < 2:
+        return (float(time_values[0]) if n else 0.0), 1.0, True
+    t0 = float(time_values[0])
+    dt = (float(time_values[-1]) - t0) / (n - 1)
+    if dt <= 0:
+        return t0, 1.0, False
+    deviation = 0.0
+    step = 1 << 20
+    for start in range(0, n, step):
+        chunk = np.asarray(time_values[start:start + step], dtype=np.float64)
+        expected = t0 + dt * np.arange(start, start + len(chunk))
+        deviation = max(deviation, float(np.max(np.abs(chunk - expected))))
+    return t0, dt, deviation <= tolerance * dt
+
+
+def precision_report(reference, single, fs, sensitivity, channels, psd_params=None):
+    # Compares float32 results against the float64 reference for the given
+    # channels: G-levels after sensitivity scaling and the Welch PSD, computed
+    # with batched_welch and psd_params (its keywords) as the PSD tab does.
+    g_error = 0.0
+    g_peak = 0.0
+    psd_error = []
+    channels = list(channels)
+    if channels:
+        block64 = reference.channels(channels)
+        block32 = single.channels(channels)
+        g64 = block64 / block64.dtype.type(sensitivity)
+        g32 = block32 / block32.dtype.type(sensitivity)
+        g_error = float(np.max(np.abs(g32.astype(np.float64) - g64)))
+        g_peak = float(np.max(np.abs(g64)))
+
+        f, p64 = batched_welch(block64, fs, **(psd_params or {}))
+        f, p32 = batched_welch(block32, fs, **(psd_params or {}))
+        # Relative error over bins that are not down in the numerical noise
+        for row64, row32 in zip(p64, p32):
+            significant = row64 > row64.max() * 1e-10
+            psd_error.append(np.abs(row32[significant] / row64[significant] - 1))
+
+    psd_error = np.concatenate(psd_error) if psd_error else np.zeros(1)
+    return {
+        "g_max_abs_error": g_error,
+        "g_max_rel_error": g_error / g_peak if g_peak else 0.0,
+        "psd_max_rel_error": float(np.max(psd_error)),
+        "psd_median_rel_error": float(np.median(psd_error)),
+    }
@@ -7,6 +7,7 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolb
 from scipy.signal import welch
 from docx import Document
 from docx.shared import Inches
+from channelcache import load_cached
 
 
 class VibrationAnalyzer:
@@ -119,6 +120,9 @@ class VibrationAnalyzer:
                 messagebox.showinfo("Success", "Velocity Data loaded successfully.\nPath: {}".format(file_path))
 
     def read_data(self, file_path):
+        return load_cached(file_path, self.parse_data)
+
+    def parse_data(self, file_path):
         if file_path.endswith('.csv'):
             return pd.read_csv(file_path)
         elif file_path.endswith('.xlsx'):
@@ -97,6 +97,9 @@ class VibrationAnalyzer:
         self.data = None
         self.velocity_data = None  # Store velocity data
 
+        # Zoom windows by (view, channel), hidden when closed and reused
+        self.detail_windows = {}
+
     def load_file(self, variable):
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx")])
         if file_path:
@@ -172,15 +175,44 @@ class VibrationAnalyzer:
             if self.glevel_plot_index is not None:
                 self.zoom_glevel_plot()
 
+    def detail_window(self, key, title, signature, draw):
+        # Embedded zoom window; only redrawn when the data or settings it
+        # was drawn from (signature) have changed
+        entry = self.detail_windows.get(key)
+        if entry is None:
+            window = tk.Toplevel(self.root)
+            fig = Figure(figsize=(10, 5))
+            canvas = FigureCanvasTkAgg(fig, window)
+            toolbar = NavigationToolbar2Tk(canvas, window)
+            toolbar.update()
+            canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            entry = {"window": window, "fig": fig, "canvas": canvas, "toolbar": toolbar, "signature": None}
+            self.detail_windows[key] = entry
+
+        entry["window"].title(title)
+        if entry["signature"] != signature:
+            entry["fig"].clf()
+            draw(entry["fig"])
+            entry["canvas"].draw()
+            entry["toolbar"].update()
+            entry["signature"] = signature
+        entry["window"].deiconify()
+        entry["window"].lift()
+
     def zoom_glevel_plot(self):
         if self.glevel_plot_index is not None:
-            plt.figure()
-        channel = self.data.columns[self.glevel_plot_index + 1]  # Exclude time column
+            index = self.glevel_plot_index
+            channel = self.data.columns[index + 1]  # Exclude time column
+            signature = (id(self.data), id(self.velocity_data), self.sensitivity.get())
+            self.detail_window(("glevel", index), channel, signature, lambda fig: self.draw_glevel_detail(fig, index))
 
-        fig, ax1 = plt.subplots()
+    def draw_glevel_detail(self, fig, index):
+        channel = self.data.columns[index + 1]  # Exclude time column
+        ax1 = fig.add_subplot(1, 1, 1)
 
         # Plot G-levels on the primary y-axis
-        ax1.plot(self.data.iloc[:, 0], self.data.iloc[:, self.glevel_plot_index + 1] / self.sensitivity.get(), label="G-levels", color='blue')
+        ax1.plot(self.data.iloc[:, 0], self.data.iloc[:, index + 1] / self.sensitivity.get(), label="G-levels", color='blue')
         ax1.set_xlabel("Time (s)")
         ax1.set_ylabel("G-levels", color='blue')
         ax1.tick_params(axis='y', labelcolor='blue')
@@ -193,9 +225,7 @@ class VibrationAnalyzer:
         ax2.tick_params(axis='y', labelcolor='orange')
         ax2.legend(loc='upper right')
 
-        plt.title(channel)
-        plt.show()
-
+        ax1.set_title(channel)
 
     # def zoom_glevel_plot(self):
     #     if self.glevel_plot_index is not None:
@@ -254,17 +284,22 @@ class VibrationAnalyzer:
 
     def zoom_psd_plot(self):
         if self.psd_plot_index is not None:
-            plt.figure()
-            channel = self.data.columns[self.psd_plot_index + 1]  # Exclude time column
-
-            # Calculate PSD using Welch method
-            f, p_s_d = welch(self.data.iloc[:, self.psd_plot_index + 1], fs=self.sampling_frequency.get())
-
-            plt.semilogy(f, p_s_d)
-            plt.title(channel)
-            plt.xlabel("Frequency (Hz)")
-            plt.ylabel("PSD")
-            plt.show()
+            index = self.psd_plot_index
+            channel = self.data.columns[index + 1]  # Exclude time column
+            signature = (id(self.data), self.sampling_frequency.get())
+            self.detail_window(("psd", index), channel, signature, lambda fig: self.draw_psd_detail(fig, index))
+
+    def draw_psd_detail(self, fig, index):
+        channel = self.data.columns[index + 1]  # Exclude time column
+
+        # Calculate PSD using Welch method
+        f, p_s_d = welch(self.data.iloc[:, index + 1], fs=self.sampling_frequency.get())
+
+        ax = fig.add_subplot(1, 1, 1)
+        ax.semilogy(f, p_s_d)
+        ax.set_title(channel)
+        ax.set_xlabel("Frequency (Hz)")
+        ax.set_ylabel("PSD")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,40 @@
+import io
+import os
+import queue
+import threading
+from collections import OrderedDict
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox as messagebox
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 from matplotlib.figure import Figure
-from scipy.signal import welch
+from scipy.signal import get_window
 from docx import Document
 from docx.shared import Inches
+from channelcache import load_columns
+from channelset import precision_report
+from events import concatenate_events, exceedance_events
+from srs import SRSEngine, srs_frequencies
+from spectral import PSDCache, SpectrogramCache, band_rms, third_octave_bands
+from settings import load_settings, save_settings
+from decimation import MinMaxPyramid, decimate, density_histogram, resample_decimate
+from plotgrid import PlotGrid
+from thumbnails import ThumbnailRenderer
+from velocitymap import binned_levels, binned_welch, sample_bins, velocity_bin_edges
+from streaming import LoadCancelled, read_csv_progress, read_xlsx_fast, should_stream, stream_csv
+
+# Thumbnails per page of the G-level and PSD grids
+CHANNELS_PER_PAGE = 24
+
+# Zoom windows kept open (hidden when closed) for instant re-display
+MAX_DETAIL_WINDOWS = 8
+
+# dB shown below the peak of the velocity-frequency map
+VELOCITY_MAP_RANGE_DB = 80.0
+
+# Rows listed in the event table, in its current sort order
+MAX_LISTED_EVENTS = 5000
 
 
 class VibrationAnalyzer:
@@ -50,18 +77,69 @@ class VibrationAnalyzer:
         tk.Button(self.input_frame, text="Load Velocity CSV/File", command=lambda: self.load_file(self.velocity_csv_file_path)).grid(row=5, column=0, columnspan=2)
 
         # Plot G-levels button
-        tk.Button(self.input_frame, text="Plot G-levels", command=self.plot_glevels).grid(row=6, column=0, columnspan=2)
+        tk.Button(self.input_frame, text="Plot G-levels", command=lambda: self.show_tab("glevel")).grid(row=6, column=0, columnspan=2)
 
         # Plot PSD button
-        tk.Button(self.input_frame, text="Plot PSD", command=self.plot_psd).grid(row=7, column=0, columnspan=2)
+        tk.Button(self.input_frame, text="Plot PSD", command=lambda: self.show_tab("psd")).grid(row=7, column=0, columnspan=2)
 
         # Save button
         self.save_button = tk.Button(self.input_frame, text="Save Images", command=self.save_images)
 
+        # Progress of background file loading, shown only while a file loads
+        self.load_progress = ttk.Progressbar(self.input_frame, mode="determinate", maximum=100, length=300)
+        self.load_status = tk.Label(self.input_frame, text="")
+        self.cancel_button = tk.Button(self.input_frame, text="Cancel Loading", command=self.cancel_load)
+
+        # float32 storage and compute for the main data
+        self.use_float32 = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.input_frame, text="Use float32 (half the memory)", variable=self.use_float32, command=self.on_precision_change).grid(row=12, column=0, columnspan=2, sticky="w")
+        tk.Button(self.input_frame, text="Check float32 Accuracy", command=self.check_precision).grid(row=13, column=0, columnspan=2)
+
+        # Plot spectrogram button
+        tk.Button(self.input_frame, text="Plot Spectrogram", command=lambda: self.show_tab("spectrogram")).grid(row=14, column=0, columnspan=2)
+
+        # Grms table button
+        tk.Button(self.input_frame, text="Grms Table", command=lambda: self.show_tab("grms")).grid(row=15, column=0, columnspan=2)
+
+        # Velocity map button
+        tk.Button(self.input_frame, text="Velocity Map", command=lambda: self.show_tab("velocity_map")).grid(row=16, column=0, columnspan=2)
+
+        # SRS button
+        tk.Button(self.input_frame, text="Plot SRS", command=lambda: self.show_tab("srs")).grid(row=17, column=0, columnspan=2)
+
+        # Event index button
+        tk.Button(self.input_frame, text="Event Index", command=lambda: self.show_tab("events")).grid(row=18, column=0, columnspan=2)
+
         # G-level plots tab
         self.glevel_plots_frame = tk.Frame(self.notebook)
         self.notebook.add(self.glevel_plots_frame, text="G-level Plots")
 
+        # Trace decimation for the G-level plots
+        self.settings = load_settings()
+        self.glevel_decimation = tk.StringVar(value=self.settings["glevel"]["decimation"])
+        self.glevel_settings_frame = tk.Frame(self.glevel_plots_frame)
+        self.glevel_settings_frame.pack(side="top", fill="x")
+        tk.Label(self.glevel_settings_frame, text="Trace decimation:").pack(side="left")
+        ttk.Combobox(self.glevel_settings_frame, textvariable=self.glevel_decimation, width=8, state="readonly", values=["minmax", "lttb"]).pack(side="left")
+        self.glevel_render = tk.StringVar(value=self.settings["glevel"]["render"])
+        tk.Label(self.glevel_settings_frame, text="Render:").pack(side="left")
+        ttk.Combobox(self.glevel_settings_frame, textvariable=self.glevel_render, width=10, state="readonly", values=["lines", "thumbnails", "density"]).pack(side="left")
+        self.glevel_velocity = tk.StringVar(value=self.settings["glevel"]["velocity"])
+        tk.Label(self.glevel_settings_frame, text="Velocity:").pack(side="left")
+        ttk.Combobox(self.glevel_settings_frame, textvariable=self.glevel_velocity, width=6, state="readonly", values=["twin", "strip"]).pack(side="left")
+        tk.Button(self.glevel_settings_frame, text="Apply", command=self.apply_glevel_settings).pack(side="left", padx=5)
+
+        # Step through the events listed on the Events tab
+        tk.Button(self.glevel_settings_frame, text="< Event", command=lambda: self.step_event(-1)).pack(side="left", padx=(15, 0))
+        tk.Button(self.glevel_settings_frame, text="Event >", command=lambda: self.step_event(1)).pack(side="left")
+
+        # Page through files with more channels than fit in one grid
+        self.glevel_page = 0
+        self.glevel_page_label = tk.Label(self.glevel_settings_frame, text="")
+        tk.Button(self.glevel_settings_frame, text="Next >", command=lambda: self.change_page("glevel", 1)).pack(side="right")
+        self.glevel_page_label.pack(side="right", padx=5)
+        tk.Button(self.glevel_settings_frame, text="< Prev", command=lambda: self.change_page("glevel", -1)).pack(side="right")
+
         # Canvas for plotting G-levels
         self.glevel_fig = plt.Figure(figsize=(14, 10))
         self.glevel_canvas = FigureCanvasTkAgg(self.glevel_fig, self.glevel_plots_frame)
@@ -78,10 +156,68 @@ class VibrationAnalyzer:
         # Store plot index for zooming G-level plots
         self.glevel_plot_index = None
 
+        # Subplots kept between re-plots; only their data is replaced
+        self.glevel_grid = PlotGrid(self.glevel_fig, self.glevel_canvas, self.glevel_toolbar)
+        self.glevel_updating = False
+
+        # Thumbnails drawn offscreen by worker processes, and the image each
+        # one is shown in; zoom windows keep their own re-decimated lines
+        self.thumbnail_renderer = ThumbnailRenderer()
+        self.thumbnail_images = []
+        self.thumbnail_polling = False
+        self.detail_lines = {}
+
+        # Velocity overlays on the vibration time base, by plot width, and the
+        # shared velocity strip under the grid when one is shown
+        self.velocity_overlays = {}
+        self.velocity_overlay_key = None
+        self.glevel_strip_line = None
+
+        # Min/max pyramids of the current and neighbouring pages, and the
+        # channel and line drawn on each G-level axis, so toolbar zoom and pan
+        # can re-decimate the visible window
+        self.glevel_pyramids = OrderedDict()
+        self.pyramid_lock = threading.Lock()
+        self.glevel_channels = []
+        self.glevel_lines = {}
+        self.glevel_axes_channels = {}
+
         # PSD plots tab
         self.psd_plots_frame = tk.Frame(self.notebook)
         self.notebook.add(self.psd_plots_frame, text="PSD Plots")
 
+        # SRS tab, next to the G-level and PSD tabs
+        self.srs_frame = tk.Frame(self.notebook)
+        self.notebook.add(self.srs_frame, text="SRS")
+
+        # PSD settings panel, restored from the previous session
+        psd_settings = self.settings["psd"]
+        self.psd_nperseg = tk.IntVar(value=psd_settings["nperseg"])
+        self.psd_overlap = tk.DoubleVar(value=psd_settings["overlap"])
+        self.psd_window = tk.StringVar(value=psd_settings["window"])
+        self.psd_detrend = tk.StringVar(value=psd_settings["detrend"])
+        self.psd_average = tk.StringVar(value=psd_settings["average"])
+
+        self.psd_settings_frame = tk.Frame(self.psd_plots_frame)
+        self.psd_settings_frame.pack(side="top", fill="x")
+        tk.Label(self.psd_settings_frame, text="Segment length:").pack(side="left")
+        ttk.Combobox(self.psd_settings_frame, textvariable=self.psd_nperseg, width=7, values=[128, 256, 512, 1024, 2048, 4096, 8192, 16384]).pack(side="left")
+        tk.Label(self.psd_settings_frame, text="Overlap (%):").pack(side="left")
+        tk.Entry(self.psd_settings_frame, textvariable=self.psd_overlap, width=5).pack(side="left")
+        tk.Label(self.psd_settings_frame, text="Window:").pack(side="left")
+        ttk.Combobox(self.psd_settings_frame, textvariable=self.psd_window, width=9, values=["hann", "hamming", "blackman", "flattop", "boxcar"]).pack(side="left")
+        tk.Label(self.psd_settings_frame, text="Detrend:").pack(side="left")
+        ttk.Combobox(self.psd_settings_frame, textvariable=self.psd_detrend, width=8, state="readonly", values=["constant", "linear", "none"]).pack(side="left")
+        tk.Label(self.psd_settings_frame, text="Averaging:").pack(side="left")
+        ttk.Combobox(self.psd_settings_frame, textvariable=self.psd_average, width=7, state="readonly", values=["mean", "median"]).pack(side="left")
+        tk.Button(self.psd_settings_frame, text="Apply", command=self.apply_psd_settings).pack(side="left", padx=5)
+
+        self.psd_page = 0
+        self.psd_page_label = tk.Label(self.psd_settings_frame, text="")
+        tk.Button(self.psd_settings_frame, text="Next >", command=lambda: self.change_page("psd", 1)).pack(side="right")
+        self.psd_page_label.pack(side="right", padx=5)
+        tk.Button(self.psd_settings_frame, text="< Prev", command=lambda: self.change_page("psd", -1)).pack(side="right")
+
         # Canvas for plotting PSD
         self.psd_fig = plt.Figure(figsize=(14, 10))
         self.psd_canvas = FigureCanvasTkAgg(self.psd_fig, self.psd_plots_frame)
@@ -92,125 +228,1667 @@ class VibrationAnalyzer:
         self.psd_toolbar.update()
         self.psd_toolbar.pack(side="bottom", fill="x")
 
+        # PSD cache hit/miss counters
+        self.psd_cache_label = tk.Label(self.psd_plots_frame, text="", anchor="w")
+        self.psd_cache_label.pack(side="bottom", fill="x")
+
         # Plot click event for PSD plots
         self.psd_fig.canvas.mpl_connect('button_press_event', self.on_psd_plot_click)
 
         # Store plot index for zooming PSD plots
         self.psd_plot_index = None
 
-        # G-levels DataFrame
+        self.psd_grid = PlotGrid(self.psd_fig, self.psd_canvas, self.psd_toolbar)
+        self.psd_axes_channels = {}
+
+        # Spectrogram tab
+        self.spectrogram_frame = tk.Frame(self.notebook)
+        self.notebook.add(self.spectrogram_frame, text="Spectrogram")
+
+        # STFT settings, separate from the Welch settings of the PSD tab
+        spectrogram_settings = self.settings["spectrogram"]
+        self.spectrogram_nperseg = tk.IntVar(value=spectrogram_settings["nperseg"])
+        self.spectrogram_overlap = tk.DoubleVar(value=spectrogram_settings["overlap"])
+        self.spectrogram_window = tk.StringVar(value=spectrogram_settings["window"])
+        self.spectrogram_range = tk.DoubleVar(value=spectrogram_settings["range"])
+
+        self.spectrogram_settings_frame = tk.Frame(self.spectrogram_frame)
+        self.spectrogram_settings_frame.pack(side="top", fill="x")
+        tk.Label(self.spectrogram_settings_frame, text="Segment length:").pack(side="left")
+        ttk.Combobox(self.spectrogram_settings_frame, textvariable=self.spectrogram_nperseg, width=7, values=[128, 256, 512, 1024, 2048, 4096, 8192]).pack(side="left")
+        tk.Label(self.spectrogram_settings_frame, text="Overlap (%):").pack(side="left")
+        tk.Entry(self.spectrogram_settings_frame, textvariable=self.spectrogram_overlap, width=5).pack(side="left")
+        tk.Label(self.spectrogram_settings_frame, text="Window:").pack(side="left")
+        ttk.Combobox(self.spectrogram_settings_frame, textvariable=self.spectrogram_window, width=9, values=["hann", "hamming", "blackman", "flattop", "boxcar"]).pack(side="left")
+        tk.Label(self.spectrogram_settings_frame, text="Range (dB):").pack(side="left")
+        tk.Entry(self.spectrogram_settings_frame, textvariable=self.spectrogram_range, width=5).pack(side="left")
+        tk.Button(self.spectrogram_settings_frame, text="Apply", command=self.apply_spectrogram_settings).pack(side="left", padx=5)
+
+        self.spectrogram_page = 0
+        self.spectrogram_page_label = tk.Label(self.spectrogram_settings_frame, text="")
+        tk.Button(self.spectrogram_settings_frame, text="Next >", command=lambda: self.change_page("spectrogram", 1)).pack(side="right")
+        self.spectrogram_page_label.pack(side="right", padx=5)
+        tk.Button(self.spectrogram_settings_frame, text="< Prev", command=lambda: self.change_page("spectrogram", -1)).pack(side="right")
+
+        # Canvas for the spectrograms; all subplots share the time axis, so
+        # zooming or panning one recomputes the visible window of the page
+        self.spectrogram_fig = plt.Figure(figsize=(14, 10))
+        self.spectrogram_canvas = FigureCanvasTkAgg(self.spectrogram_fig, self.spectrogram_frame)
+        self.spectrogram_canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+
+        self.spectrogram_toolbar = NavigationToolbar2Tk(self.spectrogram_canvas, self.spectrogram_frame)
+        self.spectrogram_toolbar.update()
+        self.spectrogram_toolbar.pack(side="bottom", fill="x")
+
+        self.spectrogram_cache_label = tk.Label(self.spectrogram_frame, text="", anchor="w")
+        self.spectrogram_cache_label.pack(side="bottom", fill="x")
+
+        self.spectrogram_grid = PlotGrid(self.spectrogram_fig, self.spectrogram_canvas, self.spectrogram_toolbar)
+        self.spectrogram_channels = []
+        self.spectrogram_columns = 0
+        self.spectrogram_updating = False
+
+        # Grms tab: overall and per-band levels of every channel from the
+        # PSD matrix (PSD tab settings), in a table sorted by clicking a heading
+        self.grms_frame = tk.Frame(self.notebook)
+        self.notebook.add(self.grms_frame, text="Grms")
+
+        self.grms_bands = tk.StringVar(value=self.settings["grms"]["bands"])
+        self.grms_settings_frame = tk.Frame(self.grms_frame)
+        self.grms_settings_frame.pack(side="top", fill="x")
+        tk.Label(self.grms_settings_frame, text="Bands:").pack(side="left")
+        ttk.Combobox(self.grms_settings_frame, textvariable=self.grms_bands, width=30, values=["1/3 octave"]).pack(side="left")
+        tk.Label(self.grms_settings_frame, text="(or ranges in Hz, e.g. 20-100, 100-500)").pack(side="left")
+        tk.Button(self.grms_settings_frame, text="Apply", command=self.apply_grms_settings).pack(side="left", padx=5)
+
+        self.grms_table = ttk.Treeview(self.grms_frame, show="headings")
+        grms_yscroll = ttk.Scrollbar(self.grms_frame, orient="vertical", command=self.grms_table.yview)
+        grms_xscroll = ttk.Scrollbar(self.grms_frame, orient="horizontal", command=self.grms_table.xview)
+        self.grms_table.configure(yscrollcommand=grms_yscroll.set, xscrollcommand=grms_xscroll.set)
+        grms_xscroll.pack(side="bottom", fill="x")
+        grms_yscroll.pack(side="right", fill="y")
+        self.grms_table.pack(side="top", fill="both", expand=True)
+
+        self.grms_header = []
+        self.grms_rows = []
+        self.grms_sort = (None, False)
+
+        # Velocity map tab: every sample is put in a velocity bin from the
+        # interpolated velocity profile, giving per-bin levels of all channels
+        # (channel x velocity heatmap) and per-bin PSDs (velocity x frequency
+        # map of one channel; click a heatmap row to pick it)
+        self.velocity_map_frame = tk.Frame(self.notebook)
+        self.notebook.add(self.velocity_map_frame, text="Velocity Map")
+
+        velocity_map_settings = self.settings["velocity_map"]
+        self.velocity_map_bins = tk.IntVar(value=velocity_map_settings["bins"])
+        self.velocity_map_metric = tk.StringVar(value=velocity_map_settings["metric"])
+        self.velocity_map_channel = tk.StringVar()
+
+        self.velocity_map_settings_frame = tk.Frame(self.velocity_map_frame)
+        self.velocity_map_settings_frame.pack(side="top", fill="x")
+        tk.Label(self.velocity_map_settings_frame, text="Velocity bins:").pack(side="left")
+        tk.Entry(self.velocity_map_settings_frame, textvariable=self.velocity_map_bins, width=5).pack(side="left")
+        tk.Label(self.velocity_map_settings_frame, text="Level:").pack(side="left")
+        ttk.Combobox(self.velocity_map_settings_frame, textvariable=self.velocity_map_metric, width=5, state="readonly", values=["rms", "peak"]).pack(side="left")
+        tk.Button(self.velocity_map_settings_frame, text="Apply", command=self.apply_velocity_map_settings).pack(side="left", padx=5)
+        tk.Label(self.velocity_map_settings_frame, text="PSD channel:").pack(side="left")
+        self.velocity_map_channel_box = ttk.Combobox(self.velocity_map_settings_frame, textvariable=self.velocity_map_channel, width=15, state="readonly")
+        self.velocity_map_channel_box.pack(side="left")
+        self.velocity_map_channel_box.bind("<<ComboboxSelected>>", lambda event: self.render_tab("velocity_map"))
+
+        self.velocity_map_fig = plt.Figure(figsize=(14, 10))
+        self.velocity_map_canvas = FigureCanvasTkAgg(self.velocity_map_fig, self.velocity_map_frame)
+        self.velocity_map_canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+
+        self.velocity_map_toolbar = NavigationToolbar2Tk(self.velocity_map_canvas, self.velocity_map_frame)
+        self.velocity_map_toolbar.update()
+        self.velocity_map_toolbar.pack(side="bottom", fill="x")
+        self.velocity_map_fig.canvas.mpl_connect('button_press_event', self.on_velocity_map_click)
+
+        self.velocity_map_grid = PlotGrid(self.velocity_map_fig, self.velocity_map_canvas, self.velocity_map_toolbar)
+        self.velocity_map_key = None
+        self.velocity_map = None
+
+        # SRS settings: quality factor and the log-spaced natural frequencies
+        srs_settings = self.settings["srs"]
+        self.srs_q = tk.DoubleVar(value=srs_settings["q"])
+        self.srs_f_min = tk.DoubleVar(value=srs_settings["f_min"])
+        self.srs_f_max = tk.DoubleVar(value=srs_settings["f_max"])
+        self.srs_per_octave = tk.IntVar(value=srs_settings["per_octave"])
+
+        self.srs_settings_frame = tk.Frame(self.srs_frame)
+        self.srs_settings_frame.pack(side="top", fill="x")
+        tk.Label(self.srs_settings_frame, text="Q:").pack(side="left")
+        tk.Entry(self.srs_settings_frame, textvariable=self.srs_q, width=5).pack(side="left")
+        tk.Label(self.srs_settings_frame, text="From (Hz):").pack(side="left")
+        tk.Entry(self.srs_settings_frame, textvariable=self.srs_f_min, width=7).pack(side="left")
+        tk.Label(self.srs_settings_frame, text="To (Hz):").pack(side="left")
+        tk.Entry(self.srs_settings_frame, textvariable=self.srs_f_max, width=7).pack(side="left")
+        tk.Label(self.srs_settings_frame, text="Points/octave:").pack(side="left")
+        ttk.Combobox(self.srs_settings_frame, textvariable=self.srs_per_octave, width=4, values=[3, 6, 12, 24]).pack(side="left")
+        tk.Button(self.srs_settings_frame, text="Apply", command=self.apply_srs_settings).pack(side="left", padx=5)
+
+        self.srs_page = 0
+        self.srs_page_label = tk.Label(self.srs_settings_frame, text="")
+        tk.Button(self.srs_settings_frame, text="Next >", command=lambda: self.change_page("srs", 1)).pack(side="right")
+        self.srs_page_label.pack(side="right", padx=5)
+        tk.Button(self.srs_settings_frame, text="< Prev", command=lambda: self.change_page("srs", -1)).pack(side="right")
+
+        self.srs_fig = plt.Figure(figsize=(14, 10))
+        self.srs_canvas = FigureCanvasTkAgg(self.srs_fig, self.srs_frame)
+        self.srs_canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+
+        self.srs_toolbar = NavigationToolbar2Tk(self.srs_canvas, self.srs_frame)
+        self.srs_toolbar.update()
+        self.srs_toolbar.pack(side="bottom", fill="x")
+
+        self.srs_status = tk.Label(self.srs_frame, text="", anchor="w")
+        self.srs_status.pack(side="bottom", fill="x")
+
+        # Spectra are computed on a worker thread (and, for long records, in
+        # worker processes); finished pages are kept for re-display
+        self.srs_grid = PlotGrid(self.srs_fig, self.srs_canvas, self.srs_toolbar)
+        self.srs_engine = SRSEngine()
+        self.srs_results = OrderedDict()
+        self.srs_queue = queue.Queue()
+        self.srs_pending = None
+        self.srs_computing = set()
+        self.srs_running = 0
+        self.srs_polling = False
+
+        # Events tab: threshold exceedances of every channel (start, duration
+        # and peak), found once per load and settings; double-click a row or
+        # step with Prev/Next to zoom the G-level view to it
+        self.events_frame = tk.Frame(self.notebook)
+        self.notebook.add(self.events_frame, text="Events")
+
+        event_settings = self.settings["events"]
+        self.event_threshold = tk.DoubleVar(value=event_settings["threshold"])
+        self.event_gap = tk.DoubleVar(value=event_settings["gap_ms"])
+
+        self.events_settings_frame = tk.Frame(self.events_frame)
+        self.events_settings_frame.pack(side="top", fill="x")
+        tk.Label(self.events_settings_frame, text="Threshold (g):").pack(side="left")
+        tk.Entry(self.events_settings_frame, textvariable=self.event_threshold, width=7).pack(side="left")
+        tk.Label(self.events_settings_frame, text="Merge gaps under (ms):").pack(side="left")
+        tk.Entry(self.events_settings_frame, textvariable=self.event_gap, width=7).pack(side="left")
+        tk.Button(self.events_settings_frame, text="Apply", command=self.apply_event_settings).pack(side="left", padx=5)
+        tk.Button(self.events_settings_frame, text="Next >", command=lambda: self.step_event(1)).pack(side="right")
+        tk.Button(self.events_settings_frame, text="< Prev", command=lambda: self.step_event(-1)).pack(side="right")
+
+        self.events_status = tk.Label(self.events_frame, text="", anchor="w")
+        self.events_status.pack(side="bottom", fill="x")
+
+        self.events_table = ttk.Treeview(self.events_frame, show="headings", selectmode="browse")
+        events_yscroll = ttk.Scrollbar(self.events_frame, orient="vertical", command=self.events_table.yview)
+        self.events_table.configure(yscrollcommand=events_yscroll.set)
+        events_yscroll.pack(side="right", fill="y")
+        self.events_table.pack(side="top", fill="both", expand=True)
+        self.events_table.bind("<Double-1>", lambda event: self.show_selected_event())
+        self.events_table.bind("<Return>", lambda event: self.show_selected_event())
+
+        # Built on a worker thread; the index listed in the table is kept
+        # apart from the newest one so row ids stay valid until it is refilled
+        self.event_index = None
+        self.event_key = None
+        self.event_listed = None
+        self.event_listed_key = None
+        self.events_sort = (None, False)
+        self.events_queue = queue.Queue()
+        self.events_building = None
+        self.events_running = 0
+        self.events_polling = False
+
+        # Bumped on every page change so stale neighbour prefetches stop
+        self.prefetch_generation = 0
+
+        # Plot tabs are only rendered while selected, and only when what they
+        # show has changed since they were last drawn (see tab_signature)
+        self.tab_frames = {"glevel": self.glevel_plots_frame, "psd": self.psd_plots_frame, "spectrogram": self.spectrogram_frame,
+                           "grms": self.grms_frame, "velocity_map": self.velocity_map_frame, "srs": self.srs_frame,
+                           "events": self.events_frame}
+        self.tab_renderers = {"glevel": self.plot_glevels, "psd": self.plot_psd, "spectrogram": self.plot_spectrogram,
+                              "grms": self.plot_grms_table, "velocity_map": self.plot_velocity_map, "srs": self.plot_srs,
+                              "events": self.plot_events}
+        self.tab_signatures = {}
+        self.pending_render = None
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+
+        # Main data channels (ChannelSet, or LazyChannels for very wide files)
         self.data = None
         self.velocity_data = None  # Store velocity data
 
-        # Store image filenames
-        self.image_filenames = []
+        # Chunked summaries of a main data file too large to load
+        self.stream_summary = None
+
+        # Computed PSDs shared by the PSD grid, zoom views and re-plots
+        self.psd_cache = PSDCache()
+
+        # Spectrogram tiles of the main data, reused while zooming and panning
+        self.spectrogram_cache = SpectrogramCache()
+        self.data_source = None
+
+        # Worker thread state for background loading
+        self.load_thread = None
+        self.load_queue = queue.Queue()
+        self.load_cancel = threading.Event()
+
+        # Report images (in-memory PNGs) by (view, channel), in click order
+        self.report_images = OrderedDict()
+
+        # Report tables by view: (title, header, rows of text)
+        self.report_tables = OrderedDict()
+
+        # Cached zoom windows by (view, channel), least recently used first
+        self.detail_windows = OrderedDict()
 
         # Set initial state of save button
         self.save_button_state(False)
 
+        # Worker pools are shut down when the window is closed
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def on_close(self):
+        # Stop the thumbnail and SRS workers, unlinking the shared memory of
+        # thumbnail batches still in flight, then close the window
+        self.thumbnail_renderer.shutdown()
+        self.srs_engine.shutdown()
+        self.root.destroy()
+
     def load_file(self, variable):
+        if self.load_thread is not None and self.load_thread.is_alive():
+            messagebox.showinfo("Busy", "Please wait for the current file to finish loading.")
+            return
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx")])
         if file_path:
-            variable.set(file_path)
-            if variable == self.csv_file_path:
-                self.data = self.read_data(file_path)
-                messagebox.showinfo("Success", "Main Data loaded successfully.\nPath: {}".format(file_path))
-            elif variable == self.velocity_csv_file_path:
-                self.velocity_data = self.read_data(file_path)
-                messagebox.showinfo("Success", "Velocity Data loaded successfully.\nPath: {}".format(file_path))
-
-    def read_data(self, file_path):
+            self.start_load(variable == self.csv_file_path, file_path)
+
+    def start_load(self, is_main, file_path):
+        # Parse on a worker thread; results come back through load_queue.
+        # The velocity profile is small and always kept in float64. Only a
+        # streamed load needs the sampling frequency and PSD settings, so
+        # only it is refused while they cannot be read. Returns whether the
+        # load was started.
+        dtype = self.storage_dtype() if is_main else np.float64
+        fs, psd_params = None, None
+        if is_main and should_stream(file_path):
+            try:
+                fs, psd_params = self.sampling_frequency.get(), self.psd_params()
+            except (tk.TclError, ValueError):
+                messagebox.showerror("Error", "This file is streamed, which uses the sampling frequency and PSD settings.\n"
+                                     "Please enter numeric values for sampling frequency, segment length and overlap.")
+                return False
+        self.load_cancel.clear()
+        self.load_thread = threading.Thread(target=self.load_worker, args=(is_main, file_path, fs, dtype, psd_params), daemon=True)
+        self.show_load_progress(True, file_path)
+        self.load_thread.start()
+        self.root.after(100, self.poll_load)
+        return True
+
+    def storage_dtype(self):
+        return np.float32 if self.use_float32.get() else np.float64
+
+    def on_precision_change(self):
+        # Reopen the main data in the new precision (served from its cache)
+        if self.load_thread is not None and self.load_thread.is_alive():
+            messagebox.showinfo("Busy", "Please wait for the current file to finish loading.")
+            self.use_float32.set(not self.use_float32.get())
+            return
+        if self.csv_file_path.get() and not self.start_load(True, self.csv_file_path.get()):
+            # The data stays in the precision it was loaded in
+            self.use_float32.set(not self.use_float32.get())
+
+    def check_precision(self):
+        if not self.csv_file_path.get() or self.data is None:
+            messagebox.showinfo("No Data", "Load main data before checking float32 accuracy.")
+            return
+        if self.load_thread is not None and self.load_thread.is_alive():
+            messagebox.showinfo("Busy", "Please wait for the current file to finish loading.")
+            return
+        # Opening the other precision may parse the whole file again, so the
+        # check runs like a load: on a worker thread with progress and cancel
+        file_path = self.csv_file_path.get()
+        try:
+            args = (file_path, self.sampling_frequency.get(), self.sensitivity.get(), self.psd_params())
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Please enter numeric values for sensitivity, sampling frequency and the PSD settings.")
+            return
+        self.load_cancel.clear()
+        self.load_thread = threading.Thread(target=self.precision_worker, args=args, daemon=True)
+        self.show_load_progress(True, file_path)
+        self.load_status.config(text="Checking float32 accuracy of {}".format(os.path.basename(file_path)))
+        self.load_thread.start()
+        self.root.after(100, self.poll_load)
+
+    def precision_worker(self, file_path, fs, sensitivity, psd_params):
+        # Runs off the Tk thread: must not touch any widget or Tk variable
+        size = os.path.getsize(file_path)
+
+        def progress(bytes_read, rows):
+            if self.load_cancel.is_set():
+                raise LoadCancelled()
+            self.load_queue.put(("progress", bytes_read, size, rows))
+
+        try:
+            reference = self.read_data(file_path, progress, np.float64)
+            single = self.read_data(file_path, progress, np.float32)
+            channels = range(min(reference.num_channels, CHANNELS_PER_PAGE))
+            report = precision_report(reference, single, fs, sensitivity, channels, psd_params)
+        except LoadCancelled:
+            self.load_queue.put(("cancelled",))
+        except Exception as e:
+            self.load_queue.put(("error", str(e)))
+        else:
+            self.load_queue.put(("precision", len(channels), report))
+
+    def show_precision_report(self, num_channels, report):
+        messagebox.showinfo("float32 Accuracy", "Compared with float64 over {} channels, with the PSD tab settings:\n\n"
+                            "G-levels: max abs error {:.3g} g (max relative {:.3g})\n"
+                            "PSD: max relative error {:.3g} (median {:.3g})".format(
+                                num_channels, report["g_max_abs_error"], report["g_max_rel_error"],
+                                report["psd_max_rel_error"], report["psd_median_rel_error"]))
+
+    def load_worker(self, is_main, file_path, fs, dtype, psd_params=None):
+        # Runs off the Tk thread: must not touch any widget or Tk variable
+        size = os.path.getsize(file_path)
+
+        def progress(bytes_read, rows):
+            if self.load_cancel.is_set():
+                raise LoadCancelled()
+            self.load_queue.put(("progress", bytes_read, size, rows))
+
+        try:
+            if is_main and should_stream(file_path):
+                # Too large to hold in memory, keep only the streamed summaries;
+                # their PSD uses the PSD settings at the time of loading
+                result = ("stream", stream_csv(file_path, fs, psd_params=psd_params, progress=progress, dtype=dtype))
+            else:
+                result = ("data", self.read_data(file_path, progress, dtype))
+        except LoadCancelled:
+            self.load_queue.put(("cancelled",))
+        except Exception as e:
+            self.load_queue.put(("error", str(e)))
+        else:
+            self.load_queue.put(("done", is_main, file_path) + result)
+
+    def poll_load(self):
+        while True:
+            try:
+                message = self.load_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if message[0] == "progress":
+                bytes_read, size, rows = message[1:]
+                if str(self.load_progress["mode"]) == "indeterminate":
+                    self.load_progress.stop()
+                    self.load_progress.config(mode="determinate")
+                self.load_progress["value"] = 100.0 * bytes_read / max(size, 1)
+                self.load_status.config(text="Parsed {} rows ({:.1f} of {:.1f} MB)".format(rows, bytes_read / 1e6, size / 1e6))
+            elif message[0] == "done":
+                self.show_load_progress(False)
+                self.finish_load(*message[1:])
+                return
+            elif message[0] == "precision":
+                self.show_load_progress(False)
+                self.show_precision_report(*message[1:])
+                return
+            elif message[0] == "cancelled":
+                self.show_load_progress(False)
+                messagebox.showinfo("Cancelled", "Loading was cancelled.")
+                return
+            elif message[0] == "error":
+                self.show_load_progress(False)
+                messagebox.showerror("Error", "Could not load file:\n{}".format(message[1]))
+                return
+
+        self.root.after(100, self.poll_load)
+
+    def finish_load(self, is_main, file_path, kind, result):
+        if is_main:
+            self.csv_file_path.set(file_path)
+            # Identifies this file and precision (or its streamed summaries)
+            # in the tab signatures and cache keys
+            if kind == "stream":
+                self.data = None
+                self.stream_summary = result
+                self.data_source = (file_path, os.path.getmtime(file_path), "stream")
+            else:
+                self.stream_summary = None
+                self.data = result
+                self.data_source = (file_path, os.path.getmtime(file_path), str(result.dtype))
+            self.psd_cache.clear()
+            self.spectrogram_cache.clear()
+            # The event index is built once per load, in the background
+            self.start_event_index()
+            messagebox.showinfo("Success", "Main Data loaded successfully.\nPath: {}".format(file_path))
+        else:
+            self.velocity_csv_file_path.set(file_path)
+            self.velocity_data = result
+            messagebox.showinfo("Success", "Velocity Data loaded successfully.\nPath: {}".format(file_path))
+        # A plot tab left open while loading is now dirty
+        self.render_current_tab()
+
+    def cancel_load(self):
+        # Only a load still running can be cancelled
+        if self.load_thread is not None and self.load_thread.is_alive():
+            self.load_cancel.set()
+            self.load_status.config(text="Cancelling...")
+
+    def show_load_progress(self, state, file_path=None):
+        if state:
+            self.load_progress["value"] = 0
+            # Excel parsing may not report progress; the bar switches to
+            # determinate on the first progress message
+            if file_path.endswith('.xlsx'):
+                self.load_progress.config(mode="indeterminate")
+                self.load_progress.start(20)
+            else:
+                self.load_progress.config(mode="determinate")
+            self.load_status.config(text="Loading {}".format(os.path.basename(file_path)))
+            self.load_progress.grid(row=9, column=0, columnspan=2, sticky="we")
+            self.load_status.grid(row=10, column=0, columnspan=2, sticky="w")
+            self.cancel_button.grid(row=11, column=0, columnspan=2)
+        else:
+            # The load has ended; a late Cancel click must not outlive it
+            self.load_cancel.clear()
+            self.load_progress.stop()
+            self.load_progress.grid_remove()
+            self.load_status.grid_remove()
+            self.cancel_button.grid_remove()
+
+    def read_data(self, file_path, progress=None, dtype=np.float64):
+        # Parsed files are converted once into a memory-mapped binary cache
+        # that is rebuilt automatically when the source file changes; very
+        # wide files are read column by column as channels are needed. Those
+        # later column reads happen after loading has finished, so they get
+        # no progress callback and cannot be cancelled.
+        return load_columns(file_path, lambda path, usecols=None: self.parse_data(path, progress, usecols), max_resident=3 * CHANNELS_PER_PAGE, dtype=dtype,
+                            lazy_parse=lambda path, usecols=None: self.parse_data(path, None, usecols))
+
+    def parse_data(self, file_path, progress=None, usecols=None):
         if file_path.endswith('.csv'):
-            return pd.read_csv(file_path)
+            return read_csv_progress(file_path, progress, usecols=usecols)
         elif file_path.endswith('.xlsx'):
-            data = pd.read_excel(file_path)
-            # Convert time data to seconds if it's in milliseconds
-            if 'Time' in data.columns:
-                if data['Time'].max() > 100:
-                    data['Time'] /= 1000  # Convert milliseconds to seconds
-            return data
+            # The time-normalised result lands in the binary cache, so a
+            # workbook is only parsed the first time it is opened
+            return read_xlsx_fast(file_path, progress, usecols=usecols)
+
+    def psd_params(self):
+        # Welch keyword arguments from the PSD settings panel
+        nperseg = max(int(self.psd_nperseg.get()), 8)
+        overlap = min(max(float(self.psd_overlap.get()), 0.0), 95.0)
+        return {
+            "nperseg": nperseg,
+            "noverlap": int(nperseg * overlap / 100.0),
+            "window": self.psd_window.get(),
+            "detrend": self.psd_detrend.get(),
+            "average": self.psd_average.get(),
+        }
+
+    def stream_psd_note(self):
+        # A streamed file's PSD was computed while it was read, so the PSD
+        # settings are fixed at load time; say so when they differ
+        used = self.stream_summary.psd_params
+        text = "Streamed file: PSD computed while loading ({}-sample segments, {} overlap, {} window, {} detrend, mean average)".format(
+            used["nperseg"], "default" if used["noverlap"] is None else "{}-sample".format(used["noverlap"]), used["window"], used["detrend"])
+        if self.stream_summary.psd()[0] is None:
+            return text + "; the file is shorter than one segment."
+        if self.psd_params() != used:
+            text += "; reload the file to apply the current settings"
+            if self.psd_params()["average"] == "median":
+                text += " (median averaging is not available for streamed files)"
+        return text
+
+    def apply_psd_settings(self):
+        try:
+            self.psd_params()
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Please enter numeric values for segment length and overlap.")
+            return
+        try:
+            get_window(self.psd_window.get(), 16)
+        except ValueError:
+            messagebox.showerror("Error", "Unknown window: {}".format(self.psd_window.get()))
+            return
+        self.settings["psd"] = {
+            "nperseg": int(self.psd_nperseg.get()),
+            "overlap": float(self.psd_overlap.get()),
+            "window": self.psd_window.get(),
+            "detrend": self.psd_detrend.get(),
+            "average": self.psd_average.get(),
+        }
+        save_settings(self.settings)
+        self.render_tab("psd")
+
+    def spectrogram_params(self):
+        # STFT keyword arguments from the spectrogram settings panel
+        nperseg = max(int(self.spectrogram_nperseg.get()), 8)
+        overlap = min(max(float(self.spectrogram_overlap.get()), 0.0), 95.0)
+        return {
+            "nperseg": nperseg,
+            "noverlap": int(nperseg * overlap / 100.0),
+            "window": self.spectrogram_window.get(),
+        }
+
+    def apply_spectrogram_settings(self):
+        try:
+            self.spectrogram_params()
+            float(self.spectrogram_range.get())
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Please enter numeric values for segment length, overlap and range.")
+            return
+        try:
+            get_window(self.spectrogram_window.get(), 16)
+        except ValueError:
+            messagebox.showerror("Error", "Unknown window: {}".format(self.spectrogram_window.get()))
+            return
+        self.settings["spectrogram"] = {
+            "nperseg": int(self.spectrogram_nperseg.get()),
+            "overlap": float(self.spectrogram_overlap.get()),
+            "window": self.spectrogram_window.get(),
+            "range": float(self.spectrogram_range.get()),
+        }
+        save_settings(self.settings)
+        self.render_tab("spectrogram")
+
+    def grms_band_edges(self, freqs):
+        # (labels, lower edges, upper edges) of the bands in the Grms settings;
+        # ValueError if a range cannot be read
+        text = self.grms_bands.get().strip()
+        if text in ("", "1/3 octave"):
+            centres, lower, upper = third_octave_bands(freqs[1], freqs[-1])
+            return ["{:g} Hz".format(centre) for centre in centres], lower, upper
+        ranges = []
+        for part in text.split(","):
+            low, high = (float(value) for value in part.split("-"))
+            if not 0 <= low < high:
+                raise ValueError(part)
+            ranges.append((low, high))
+        labels = ["{:g}-{:g} Hz".format(low, high) for low, high in ranges]
+        return labels, np.array([low for low, high in ranges]), np.array([high for low, high in ranges])
+
+    def apply_grms_settings(self):
+        try:
+            self.grms_band_edges(np.array([0.0, 1.0, 2.0]))
+        except ValueError:
+            messagebox.showerror("Error", "Please enter bands as \"1/3 octave\" or ranges in Hz, e.g. 20-100, 100-500.")
+            return
+        self.settings["grms"] = {"bands": self.grms_bands.get().strip()}
+        save_settings(self.settings)
+        self.render_tab("grms")
+
+    def apply_velocity_map_settings(self):
+        try:
+            bins = int(self.velocity_map_bins.get())
+        except (tk.TclError, ValueError):
+            bins = 0
+        if bins < 1:
+            messagebox.showerror("Error", "Please enter a positive whole number of velocity bins.")
+            return
+        self.settings["velocity_map"] = {"bins": bins, "metric": self.velocity_map_metric.get()}
+        save_settings(self.settings)
+        self.render_tab("velocity_map")
+
+    def srs_params(self):
+        # (q, f_min, f_max, points per octave) from the SRS settings panel
+        return (float(self.srs_q.get()), float(self.srs_f_min.get()), float(self.srs_f_max.get()), int(self.srs_per_octave.get()))
+
+    def apply_srs_settings(self):
+        try:
+            q, f_min, f_max, per_octave = self.srs_params()
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Please enter numeric values for Q, frequencies and points per octave.")
+            return
+        if not (q > 0.5 and 0 < f_min < f_max and per_octave > 0):
+            messagebox.showerror("Error", "Q must be above 0.5, frequencies must increase from above 0 Hz, and points per octave must be positive.")
+            return
+        self.settings["srs"] = {"q": q, "f_min": f_min, "f_max": f_max, "per_octave": per_octave}
+        save_settings(self.settings)
+        self.render_tab("srs")
+
+    def event_params(self):
+        # (threshold in g, merge gap in ms) from the Events settings panel
+        return float(self.event_threshold.get()), float(self.event_gap.get())
+
+    def apply_event_settings(self):
+        try:
+            threshold, gap_ms = self.event_params()
+        except (tk.TclError, ValueError):
+            messagebox.showerror("Error", "Please enter numeric values for the threshold and merge gap.")
+            return
+        if not (threshold > 0 and gap_ms >= 0):
+            messagebox.showerror("Error", "The threshold must be above 0 g and the merge gap must not be negative.")
+            return
+        self.settings["events"] = {"threshold": threshold, "gap_ms": gap_ms}
+        save_settings(self.settings)
+        self.render_tab("events")
+
+    def apply_glevel_settings(self):
+        self.settings["glevel"]["decimation"] = self.glevel_decimation.get()
+        self.settings["glevel"]["render"] = self.glevel_render.get()
+        self.settings["glevel"]["velocity"] = self.glevel_velocity.get()
+        save_settings(self.settings)
+        self.render_tab("glevel")
+
+    def subplot_pixels(self, fig, num_cols):
+        # Approximate on-screen width of one subplot in a grid of num_cols columns
+        return max(int(fig.get_figwidth() * fig.dpi * 0.8 / num_cols), 50)
+
+    def channel_names(self):
+        if self.stream_summary is not None:
+            return self.stream_summary.names
+        return self.data.names
+
+    def page_channels(self, page):
+        # Channel indices shown on one page of the thumbnail grids
+        start = page * CHANNELS_PER_PAGE
+        return list(range(start, min(start + CHANNELS_PER_PAGE, len(self.channel_names()))))
+
+    def num_pages(self):
+        return max(1, -(-len(self.channel_names()) // CHANNELS_PER_PAGE))
+
+    def change_page(self, kind, step):
+        if self.data is None and self.stream_summary is None:
+            return
+        if kind == "glevel":
+            self.glevel_page = min(max(self.glevel_page + step, 0), self.num_pages() - 1)
+        elif kind == "spectrogram":
+            self.spectrogram_page = min(max(self.spectrogram_page + step, 0), self.num_pages() - 1)
+        elif kind == "srs":
+            self.srs_page = min(max(self.srs_page + step, 0), self.num_pages() - 1)
+        else:
+            self.psd_page = min(max(self.psd_page + step, 0), self.num_pages() - 1)
+        self.render_tab(kind)
+
+    def tab_signature(self, kind):
+        # Everything the plots of a tab are drawn from: loaded files,
+        # sensitivity, sampling frequency, the tab's settings and page.
+        # None while an entry holds an invalid value; the tab is then not
+        # drawn (see render_tab).
+        try:
+            signature = (kind, self.data_source, id(self.data), id(self.stream_summary),
+                         self.sensitivity.get(), self.sampling_frequency.get())
+            if kind == "glevel":
+                return signature + (id(self.velocity_data), self.glevel_decimation.get(), self.glevel_render.get(),
+                                    self.glevel_velocity.get(), self.glevel_page)
+            if kind == "psd":
+                return signature + (tuple(self.psd_params().items()), self.psd_page)
+            if kind == "grms":
+                self.grms_band_edges(np.array([0.0, 1.0, 2.0]))
+                return signature + (tuple(self.psd_params().items()), self.grms_bands.get())
+            if kind == "srs":
+                return signature + (self.srs_params(), self.srs_page)
+            if kind == "events":
+                return signature + (self.event_params(), self.event_key)
+            if kind == "velocity_map":
+                return signature + (id(self.velocity_data), tuple(self.psd_params().items()), self.velocity_map_bins.get(),
+                                    self.velocity_map_metric.get(), self.velocity_map_channel.get())
+            return signature + (tuple(self.spectrogram_params().items()), float(self.spectrogram_range.get()), self.spectrogram_page)
+        except (tk.TclError, ValueError):
+            return None
+
+    def tab_entry_error(self, kind):
+        # Message for a tab whose signature cannot be read
+        fields = {
+            "glevel": "",
+            "psd": ", segment length and overlap",
+            "grms": ", segment length and overlap, and bands as \"1/3 octave\" or ranges in Hz, e.g. 20-100, 100-500",
+            "spectrogram": ", segment length, overlap and range",
+            "velocity_map": ", segment length, overlap and velocity bins",
+            "srs": ", Q, frequencies and points per octave",
+            "events": ", threshold and merge gap",
+        }
+        return "Please enter numeric values for sensitivity, sampling frequency{}.".format(fields.get(kind, ""))
+
+    def selected_tab(self):
+        # Kind of the plot tab on screen, None for the Input tab
+        selected = self.notebook.select()
+        for kind, frame in self.tab_frames.items():
+            if str(frame) == selected:
+                return kind
+        return None
+
+    def show_tab(self, kind):
+        # Plot buttons: bring a tab up; it renders itself if it is dirty
+        if self.data is None and self.stream_summary is None:
+            return
+        if self.selected_tab() == kind:
+            self.render_tab(kind)
+        else:
+            self.notebook.select(self.tab_frames[kind])
+
+    def on_tab_changed(self, event):
+        # Work still running for the tab just left is dropped, and the new
+        # tab renders once Tk is idle, so flicking through several tabs only
+        # draws the last one
+        self.cancel_stale_renders()
+        if self.pending_render is not None:
+            self.root.after_cancel(self.pending_render)
+        self.pending_render = self.root.after_idle(self.render_current_tab)
+
+    def render_current_tab(self):
+        self.pending_render = None
+        kind = self.selected_tab()
+        if kind is not None:
+            self.render_tab(kind)
+
+    def render_tab(self, kind):
+        # Draw a tab only while it is selected and only if it is dirty
+        if self.selected_tab() != kind:
+            return
+        signature = self.tab_signature(kind)
+        if signature is None:
+            # The renderer would read the same invalid entry and fail
+            messagebox.showerror("Error", self.tab_entry_error(kind))
+            return
+        if signature == self.tab_signatures.get(kind):
+            return
+        self.tab_renderers[kind]()
+        self.tab_signatures[kind] = signature
+
+    def cancel_stale_renders(self):
+        # Neighbour-page prefetches stop at their next page, and thumbnails
+        # not drawn yet are cancelled; the G-level tab is then redrawn in
+        # full when it is shown again
+        self.prefetch_generation += 1
+        if self.thumbnail_renderer.cancel():
+            self.tab_signatures.pop("glevel", None)
+        # An SRS still computing is kept for later but not drawn
+        if self.srs_pending is not None:
+            self.srs_pending = None
+            self.tab_signatures.pop("srs", None)
+
+    def page_label(self, channels):
+        return "Channels {}-{} of {}".format(channels[0] + 1, channels[-1] + 1, len(self.channel_names()))
+
+    def prefetch_pages(self, prepare, page):
+        # Prepare the pages either side of the one shown on a background
+        # thread, so flipping to them only has to draw
+        self.prefetch_generation += 1
+        pages = [p for p in (page + 1, page - 1) if 0 <= p < self.num_pages()]
+        threading.Thread(target=self.prefetch_worker, args=(prepare, pages, self.prefetch_generation), daemon=True).start()
+
+    def prefetch_worker(self, prepare, pages, generation):
+        # Runs off the Tk thread: must not touch any widget or Tk variable
+        for page in pages:
+            if generation != self.prefetch_generation:
+                return
+            try:
+                prepare(self.page_channels(page))
+            except Exception:
+                # Whatever failed is computed again when the page is shown
+                return
 
     def plot_glevels(self):
-        if self.data is not None and self.velocity_data is not None:
-            num_channels = len(self.data.columns) - 1  # Exclude time column
-            num_plots = min(num_channels, 24)
+        if (self.data is not None or self.stream_summary is not None) and self.velocity_data is not None:
+            names = self.channel_names()
+            self.glevel_page = min(self.glevel_page, self.num_pages() - 1)
+            channels = self.page_channels(self.glevel_page)
+            num_plots = len(channels)
+
+            if self.stream_summary is not None:
+                env_time, env_min, env_max = self.stream_summary.envelope()
+            else:
+                # Pull the displayed channels in one pass if they are loaded lazily
+                self.data.prefetch(channels, time=True)
 
             # Calculate number of rows and columns
             num_rows = (num_plots - 1) // 6 + 1
             num_cols = min(num_plots, 6)
 
-            # Clear previous plots
-            self.glevel_fig.clf()
+            pixels = self.subplot_pixels(self.glevel_fig, num_cols)
+            velocity_time, velocity_values = self.velocity_overlay(pixels)
+            strip = self.glevel_velocity.get() == "strip"
 
-            # Plot small images of G-levels
-            for i in range(num_plots):
-                channel = self.data.columns[i + 1]  # Exclude time column
-                ax = self.glevel_fig.add_subplot(num_rows, num_cols, i + 1)
+            streamed = self.stream_summary is not None
+            render = "lines" if streamed else self.glevel_render.get()
+            if render != "density" and not streamed:
+                # Reduce every trace to about two points per pixel of subplot width
+                if self.glevel_decimation.get() == "lttb":
+                    indices, traces = decimate(self.data.channels(channels), pixels, "lttb")
+                else:
+                    indices, traces = self.glevel_levels(channels).query(range(num_plots), 0, self.data.num_samples, pixels)
+                trace_time = self.data.time_at(indices)
+                traces = traces / traces.dtype.type(self.sensitivity.get())
 
-                # Plot G-levels
-                ax.plot(self.data.iloc[:, 0], self.data.iloc[:, i + 1] / self.sensitivity.get(), label="G-levels", color='blue')
+            self.glevel_channels = channels
+            self.glevel_lines = {}
+            self.glevel_axes_channels = {}
+            if render == "thumbnails":
+                self.plot_glevel_thumbnails(channels, trace_time, traces, velocity_time, velocity_values, num_rows, num_cols, strip)
+            elif render == "density":
+                self.plot_glevel_density(channels, velocity_time, velocity_values, num_rows, num_cols, strip)
+            else:
+                # Build the grid only if the number of plots changed, then
+                # update its titles and lines in place
+                cells, rebuilt = self.glevel_grid.ensure((num_plots, streamed, strip), lambda fig: self.build_glevel_grid(fig, num_plots, num_rows, num_cols, streamed, strip))
+                self.glevel_updating = True
+                retitled = False
+                for i, (ax, ax2, line, velocity_line) in enumerate(cells):
+                    channel = channels[i]
+                    if ax.get_title() != names[channel]:
+                        ax.set_title(names[channel], fontsize=8)
+                        retitled = True
+                    if streamed:
+                        for collection in list(ax.collections):
+                            collection.remove()
+                        ax.fill_between(env_time, env_min[channel] / self.sensitivity.get(), env_max[channel] / self.sensitivity.get(), label="G-levels", color='blue')
+                    else:
+                        line.set_data(trace_time[i], traces[i])
+                        self.glevel_lines[ax] = (channels, i, channel, line)
+                    self.set_velocity(ax, ax2, velocity_line, channel, velocity_time, velocity_values)
+                if self.glevel_strip_line is not None:
+                    self.glevel_strip_line.set_data(velocity_time, velocity_values)
+                moved = self.glevel_grid.rescale()
+                self.glevel_updating = False
+                self.glevel_grid.redraw(full=rebuilt or moved or retitled)
+            self.glevel_page_label.config(text=self.page_label(channels))
 
-                # Add secondary y-axis for velocity
-                ax2 = ax.twinx()
-                ax2.plot(self.velocity_data.iloc[:, 0], self.velocity_data.iloc[:, 1], label="Velocity", color='orange')
+            if self.stream_summary is None:
+                if self.glevel_decimation.get() == "lttb":
+                    self.prefetch_pages(self.data.prefetch, self.glevel_page)
+                else:
+                    self.prefetch_pages(self.glevel_levels, self.glevel_page)
 
-                ax.set_title(channel, fontsize=8)
-                ax.set_xlabel("Time (s)", fontsize=10)
-                ax.set_ylabel("G-levels", fontsize=8)
-                ax2.set_ylabel("Velocity", fontsize=8)
+            # Enable save button
+            self.save_button_state(True)
 
-                ax.tick_params(axis='x', rotation=45, labelsize=8)
-                ax.tick_params(axis='both', which='major', pad=2)
+    def build_glevel_grid(self, fig, num_plots, num_rows, num_cols, streamed, strip=False):
+        # Axes, twin velocity axes, labels and legends of the G-level grid,
+        # holding empty artists that plot_glevels fills in
+        cells = []
+        axes = self.grid_axes(fig, num_plots, num_rows, num_cols, strip)
+        for ax in axes:
+            # Plot G-levels
+            if streamed:
+                line = ax.fill_between([], [], [], label="G-levels", color='blue')
+            else:
+                line, = ax.plot([], [], label="G-levels", color='blue')
+                ax.callbacks.connect('xlim_changed', self.on_glevel_xlim_changed)
 
-                ax.legend(loc='upper left')
-                ax2.legend(loc='upper right')
+            ax2, velocity_line = self.twin_velocity_axes(ax, strip)
 
-            # Adjust spacing between plot frames
-            self.glevel_fig.subplots_adjust(hspace=1, wspace=0.5, top=0.95)
+            ax.set_xlabel("Time (s)", fontsize=10)
+            ax.set_ylabel("G-levels", fontsize=8)
 
-            self.glevel_canvas.draw()
+            ax.tick_params(axis='x', rotation=45, labelsize=8)
+            ax.tick_params(axis='both', which='major', pad=2)
 
-            # Switch to the G-level Plots tab
-            self.notebook.select(self.glevel_plots_frame)
+            ax.legend(loc='upper left')
+            cells.append((ax, ax2, line, velocity_line))
+
+        # Adjust spacing between plot frames
+        fig.subplots_adjust(hspace=1, wspace=0.5, top=0.95)
+        return cells
+
+    def grid_axes(self, fig, num_plots, num_rows, num_cols, strip):
+        # One subplot per channel; with strip, one full-width velocity axis
+        # goes under the grid instead of a twin axis in every subplot
+        self.glevel_strip_line = None
+        if not strip:
+            return [fig.add_subplot(num_rows, num_cols, i + 1) for i in range(num_plots)]
+        grid = fig.add_gridspec(num_rows + 1, num_cols, height_ratios=[1] * num_rows + [0.6])
+        axes = [fig.add_subplot(grid[i // num_cols, i % num_cols]) for i in range(num_plots)]
+        strip_ax = fig.add_subplot(grid[num_rows, :])
+        self.glevel_strip_line, = strip_ax.plot([], [], label="Velocity", color='orange')
+        strip_ax.set_xlabel("Time (s)", fontsize=10)
+        strip_ax.set_ylabel("Velocity", fontsize=8)
+        strip_ax.tick_params(axis='x', labelsize=8)
+        strip_ax.legend(loc='upper right')
+        return axes
+
+    def twin_velocity_axes(self, ax, strip):
+        # Add secondary y-axis for velocity, unless it is shown in the strip
+        if strip:
+            return None, None
+        ax2 = ax.twinx()
+        velocity_line, = ax2.plot([], [], label="Velocity", color='orange')
+        ax2.set_ylabel("Velocity", fontsize=8)
+        ax2.legend(loc='upper right')
+        return ax2, velocity_line
+
+    def set_velocity(self, ax, ax2, velocity_line, channel, velocity_time, velocity_values):
+        self.glevel_axes_channels[ax] = channel
+        if ax2 is not None:
+            velocity_line.set_data(velocity_time, velocity_values)
+            self.glevel_axes_channels[ax2] = channel
+
+    def velocity_overlay(self, pixels):
+        # Velocity profile resampled onto the vibration time base and min/max
+        # decimated to the plot width. Computed once per pair of loaded files
+        # and width, then shared by every subplot and the zoom views.
+        key = (id(self.velocity_data), id(self.data), id(self.stream_summary))
+        if self.velocity_overlay_key != key:
+            self.velocity_overlays = {}
+            self.velocity_overlay_key = key
+        if pixels not in self.velocity_overlays:
+            velocity_time = self.velocity_data.time()
+            velocity_values = self.velocity_data.channel(0)
+            if self.stream_summary is not None:
+                # The envelope time base is already at screen resolution
+                env_time = self.stream_summary.envelope()[0]
+                overlay = (env_time, np.interp(env_time, velocity_time, velocity_values))
+            else:
+                indices, values = resample_decimate(velocity_time, velocity_values, self.data.time, self.data.num_samples, pixels)
+                overlay = (self.data.time_at(indices[0]), values[0])
+            self.velocity_overlays[pixels] = overlay
+        return self.velocity_overlays[pixels]
+
+    def plot_glevel_thumbnails(self, channels, trace_time, traces, velocity_time, velocity_values, num_rows, num_cols, strip=False):
+        # One image per channel, drawn by the worker pool from the decimated
+        # traces in shared memory and filled in as each worker finishes
+        cells, rebuilt = self.glevel_grid.ensure((len(channels), "thumbnails", strip), lambda fig: self.build_thumbnail_grid(fig, len(channels), num_rows, num_cols, strip))
+        blank = np.full((1, 1, 4), 255, dtype=np.uint8)
+        self.thumbnail_images = []
+        for i, (ax, image) in enumerate(cells):
+            image.set_data(blank)
+            self.thumbnail_images.append(image)
+            self.glevel_axes_channels[ax] = channels[i]
+        self.glevel_grid.redraw(full=rebuilt)
+
+        box = cells[0][0].bbox
+        arrays = {"time": trace_time, "trace": traces}
+        if strip:
+            self.glevel_strip_line.set_data(velocity_time, velocity_values)
+            self.glevel_grid.rescale()
+            self.glevel_grid.redraw(full=True)
+        else:
+            arrays.update({"velocity_time": velocity_time, "velocity": velocity_values})
+        names = self.channel_names()
+        self.thumbnail_renderer.start(arrays, [names[channel] for channel in channels], int(box.width), int(box.height), self.glevel_fig.dpi)
+        if not self.thumbnail_polling:
+            self.thumbnail_polling = True
+            self.root.after(50, self.poll_thumbnails)
+
+    def plot_glevel_density(self, channels, velocity_time, velocity_values, num_rows, num_cols, strip=False):
+        # Each channel as a shaded 2-D histogram of (time, G-level) at the
+        # pixel size of its axes, so hour-long records show how the amplitude
+        # is distributed over time instead of a solid band of lines
+        names = self.channel_names()
+        cells, rebuilt = self.glevel_grid.ensure((len(channels), "density", strip), lambda fig: self.build_density_grid(fig, len(channels), num_rows, num_cols, strip))
+        box = cells[0][0].bbox
+        block = self.data.channels(channels)
+        # Exact limits from the pyramid when this page already has one,
+        # saving a min/max pass over the samples
+        pyramid = self.glevel_pyramids.get((self.data_source, id(self.data), tuple(channels)))
+        limits = pyramid.limits() if pyramid is not None else None
+        counts, lo, hi = density_histogram(block, max(int(box.width), 10), max(int(box.height), 10), limits)
+
+        shade = np.log1p(counts.astype(np.float32))
+        shade /= np.maximum(shade.max(axis=(1, 2), keepdims=True), 1)
+        sensitivity = self.sensitivity.get()
+        t_first, t_last = self.data.time_at([0, self.data.num_samples - 1])
+
+        retitled = False
+        for i, (ax, ax2, image, velocity_line) in enumerate(cells):
+            channel = channels[i]
+            if ax.get_title() != names[channel]:
+                ax.set_title(names[channel], fontsize=8)
+                retitled = True
+            image.set_data(shade[i])
+            image.set_extent((t_first, t_last, lo[i] / sensitivity, hi[i] / sensitivity))
+            self.set_velocity(ax, ax2, velocity_line, channel, velocity_time, velocity_values)
+        if self.glevel_strip_line is not None:
+            self.glevel_strip_line.set_data(velocity_time, velocity_values)
+        moved = self.glevel_grid.rescale()
+        self.glevel_grid.redraw(full=rebuilt or moved or retitled)
+
+    def build_density_grid(self, fig, num_plots, num_rows, num_cols, strip=False):
+        cells = []
+        for ax in self.grid_axes(fig, num_plots, num_rows, num_cols, strip):
+            image = ax.imshow(np.zeros((1, 1)), origin="lower", aspect="auto", cmap="Blues", vmin=0, vmax=1, interpolation="nearest", extent=(0, 1, 0, 1))
+            ax2, velocity_line = self.twin_velocity_axes(ax, strip)
+
+            ax.set_xlabel("Time (s)", fontsize=10)
+            ax.set_ylabel("G-levels", fontsize=8)
+
+            ax.tick_params(axis='x', rotation=45, labelsize=8)
+            ax.tick_params(axis='both', which='major', pad=2)
+
+            cells.append((ax, ax2, image, velocity_line))
+
+        # Adjust spacing between plot frames
+        fig.subplots_adjust(hspace=1, wspace=0.5, top=0.95)
+        return cells
+
+    def build_thumbnail_grid(self, fig, num_plots, num_rows, num_cols, strip=False):
+        # Bare axes holding one image each; titles and ticks are part of the
+        # rendered thumbnails
+        cells = []
+        for ax in self.grid_axes(fig, num_plots, num_rows, num_cols, strip):
+            ax.set_axis_off()
+            image = ax.imshow(np.full((1, 1, 4), 255, dtype=np.uint8), extent=(0, 1, 0, 1), aspect="auto", interpolation="none")
+            cells.append((ax, image))
+        if strip:
+            fig.subplots_adjust(left=0.05, right=0.99, bottom=0.06, top=0.99, wspace=0.02, hspace=0.1)
+        else:
+            fig.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.99, wspace=0.02, hspace=0.02)
+        return cells
+
+    def poll_thumbnails(self):
+        results, pending = self.thumbnail_renderer.poll()
+        for row, pixels in results:
+            if row < len(self.thumbnail_images):
+                self.thumbnail_images[row].set_data(pixels)
+        if results:
+            self.glevel_grid.redraw()
+        if pending or self.thumbnail_renderer.batches:
+            self.root.after(50, self.poll_thumbnails)
+        else:
+            self.thumbnail_polling = False
+
+    def glevel_levels(self, channels):
+        # Built once per loaded file and page, then reused by every re-plot;
+        # the current page and its neighbours are kept
+        data = self.data
+        key = (self.data_source, id(data), tuple(channels))
+        with self.pyramid_lock:
+            if key in self.glevel_pyramids:
+                self.glevel_pyramids.move_to_end(key)
+                return self.glevel_pyramids[key]
+        pyramid = MinMaxPyramid(data.channels(channels))
+        with self.pyramid_lock:
+            self.glevel_pyramids[key] = pyramid
+            while len(self.glevel_pyramids) > 3:
+                self.glevel_pyramids.popitem(last=False)
+        return pyramid
+
+    def on_glevel_xlim_changed(self, ax):
+        # Toolbar zoom/pan: replace the trace with the visible window decimated
+        # to the axis width in pixels
+        entry = self.glevel_lines.get(ax) or self.detail_lines.get(ax)
+        if self.glevel_updating or entry is None or self.data is None:
+            return
+        channels, row, channel, line = entry
+        start, stop = self.data.sample_range(*ax.get_xlim())
+        pixels = max(int(ax.bbox.width), 50)
+        if self.glevel_decimation.get() == "lttb":
+            indices, trace = decimate(self.data.channel(channel)[start:stop], pixels, "lttb", start)
+        else:
+            indices, trace = self.glevel_levels(channels).query([row], start, stop, pixels)
+        if indices.shape[1]:
+            line.set_data(self.data.time_at(indices[0]), trace[0] / trace.dtype.type(self.sensitivity.get()))
+            ax.figure.canvas.draw_idle()
+
+    def plot_psd(self):
+        if self.data is not None or self.stream_summary is not None:
+            names = self.channel_names()
+            self.psd_page = min(self.psd_page, self.num_pages() - 1)
+            channels = self.page_channels(self.psd_page)
+            num_plots = len(channels)
+
+            # Welch PSD of all displayed channels in one batched call
+            if self.stream_summary is not None:
+                freqs, psd_block = self.stream_summary.psd()
+                self.psd_cache_label.config(text=self.stream_psd_note())
+                if freqs is None:
+                    return
+                psd_block = psd_block[channels]
+            else:
+                fs = self.sampling_frequency.get()
+                params = self.psd_params()
+                freqs, psd_block = self.psd_cache.psd(self.data_source, self.data, channels, fs, **params)
+                self.psd_cache_label.config(text=self.psd_cache.stats())
+
+            # Calculate number of rows and columns
+            num_rows = (num_plots - 1) // 6 + 1
+            num_cols = min(num_plots, 6)
+
+            cells, rebuilt = self.psd_grid.ensure(num_plots, lambda fig: self.build_psd_grid(fig, num_plots, num_rows, num_cols))
+            self.psd_axes_channels = {}
+            retitled = False
+            for i, (ax, line) in enumerate(cells):
+                if ax.get_title() != names[channels[i]]:
+                    ax.set_title(names[channels[i]], fontsize=8)
+                    retitled = True
+                line.set_data(freqs, psd_block[i])
+                self.psd_axes_channels[ax] = channels[i]
+            moved = self.psd_grid.rescale()
+            self.psd_grid.redraw(full=rebuilt or moved or retitled)
+            self.psd_page_label.config(text=self.page_label(channels))
+
+            if self.stream_summary is None:
+                source, data = self.data_source, self.data
+                self.prefetch_pages(lambda page: self.psd_cache.psd(source, data, page, fs, **params), self.psd_page)
 
             # Enable save button
             self.save_button_state(True)
 
-    def plot_psd(self):
+    def build_psd_grid(self, fig, num_plots, num_rows, num_cols):
+        cells = []
+        for i in range(num_plots):
+            ax = fig.add_subplot(num_rows, num_cols, i + 1)
+            line, = ax.semilogy([], [])
+            ax.set_xlabel("Frequency (Hz)", fontsize=8)
+            ax.set_ylabel("PSD", fontsize=8)
+            cells.append((ax, line))
+
+        # Adjust spacing between plot frames
+        fig.subplots_adjust(hspace=1, wspace=0.5, top=0.95)
+        return cells
+
+    def plot_spectrogram(self):
+        if self.stream_summary is not None:
+            messagebox.showinfo("Spectrogram", "This file was too large to load and only its summaries were kept; a spectrogram needs the full record.")
+            return
         if self.data is not None:
-            num_channels = len(self.data.columns) - 1  # Exclude time column
-            num_plots = min(num_channels, 24)
+            names = self.channel_names()
+            self.spectrogram_page = min(self.spectrogram_page, self.num_pages() - 1)
+            channels = self.page_channels(self.spectrogram_page)
+            num_plots = len(channels)
 
             # Calculate number of rows and columns
             num_rows = (num_plots - 1) // 6 + 1
             num_cols = min(num_plots, 6)
 
-            # Clear previous plots
-            self.psd_fig.clf()
+            cells, rebuilt = self.spectrogram_grid.ensure(num_plots, lambda fig: self.build_spectrogram_grid(fig, num_plots, num_rows, num_cols))
+            retitled = False
+            for i, (ax, image) in enumerate(cells):
+                if ax.get_title() != names[channels[i]]:
+                    ax.set_title(names[channels[i]], fontsize=8)
+                    retitled = True
+            self.spectrogram_channels = channels
+            # One column per pixel; the page prefetch uses the same count so
+            # its tiles are the ones this view asks for
+            self.spectrogram_columns = self.subplot_pixels(self.spectrogram_fig, num_cols)
+            self.spectrogram_updating = True
+            self.update_spectrogram(0, self.data.num_samples)
+            moved = self.spectrogram_grid.rescale()
+            self.spectrogram_updating = False
+            self.spectrogram_grid.redraw(full=rebuilt or moved or retitled)
+            self.spectrogram_page_label.config(text=self.page_label(channels))
 
-            # Plot small images of PSD
-            for i in range(num_plots):
-                channel = self.data.columns[i + 1]  # Exclude time column
-                ax = self.psd_fig.add_subplot(num_rows, num_cols, i + 1)
+            source, data = self.data_source, self.data
+            fs, params, sensitivity = self.sampling_frequency.get(), self.spectrogram_params(), self.sensitivity.get()
+            columns = self.spectrogram_columns
+            self.prefetch_pages(lambda page: self.spectrogram_cache.spectrogram(source, data, page, fs, columns=columns, sensitivity=sensitivity, **params), self.spectrogram_page)
 
-                # Calculate PSD using Welch method
-                f, p_s_d = welch(self.data.iloc[:, i + 1], fs=self.sampling_frequency.get())
+    def update_spectrogram(self, start, stop):
+        # Spectra of samples [start, stop) of every channel on the page, at
+        # about one column per pixel of subplot width, shown in dB with each
+        # channel's colour scale spanning the chosen range below its peak
+        cells = self.spectrogram_grid.cells
+        edges, freqs, power = self.spectrogram_cache.spectrogram(
+            self.data_source, self.data, self.spectrogram_channels, self.sampling_frequency.get(), start, stop,
+            self.spectrogram_columns, sensitivity=self.sensitivity.get(), **self.spectrogram_params())
+        self.spectrogram_cache_label.config(text=self.spectrogram_cache.stats())
+        if power.shape[1] == 0:
+            return
 
-                ax.semilogy(f, p_s_d)
-                ax.set_title(channel, fontsize=8)
-                ax.set_xlabel("Frequency (Hz)", fontsize=8)
-                ax.set_ylabel("PSD", fontsize=8)
+        level = 10 * np.log10(np.maximum(power, np.finfo(power.dtype).tiny))
+        dynamic_range = float(self.spectrogram_range.get())
+        last = self.data.num_samples - 1
+        t_first, t_last = self.data.time_at(np.clip(np.round([edges[0], edges[-1]]), 0, last).astype(np.int64))
+        half_bin = (freqs[1] - freqs[0]) / 2 if len(freqs) > 1 else 0.5
+        for i, (ax, image) in enumerate(cells):
+            image.set_data(level[i].T)
+            image.set_extent((t_first, t_last, freqs[0] - half_bin, freqs[-1] + half_bin))
+            peak = float(level[i].max())
+            image.set_clim(peak - dynamic_range, peak)
 
-            # Adjust spacing between plot frames
-            self.psd_fig.subplots_adjust(hspace=1, wspace=0.5, top=0.95)
+    def build_spectrogram_grid(self, fig, num_plots, num_rows, num_cols):
+        cells = []
+        for i in range(num_plots):
+            ax = fig.add_subplot(num_rows, num_cols, i + 1, sharex=cells[0][0] if cells else None)
+            image = ax.imshow(np.zeros((1, 1)), origin="lower", aspect="auto", cmap="viridis", interpolation="nearest", extent=(0, 1, 0, 1))
+            ax.set_xlabel("Time (s)", fontsize=8)
+            ax.set_ylabel("Frequency (Hz)", fontsize=8)
+            ax.tick_params(axis='x', rotation=45, labelsize=8)
+            ax.tick_params(axis='both', which='major', pad=2)
+            cells.append((ax, image))
+        # Shared x axes report every zoom or pan through the first one
+        cells[0][0].callbacks.connect('xlim_changed', self.on_spectrogram_xlim_changed)
 
-            self.psd_canvas.draw()
+        # Adjust spacing between plot frames
+        fig.subplots_adjust(hspace=1, wspace=0.5, top=0.95)
+        return cells
 
-            # Switch to the PSD Plots tab
-            self.notebook.select(self.psd_plots_frame)
+    def on_spectrogram_xlim_changed(self, ax):
+        # Toolbar zoom/pan: recompute the visible window, which only
+        # evaluates the tiles not cached yet
+        if self.spectrogram_updating or self.data is None or not self.spectrogram_channels:
+            return
+        start, stop = self.data.sample_range(*ax.get_xlim())
+        self.spectrogram_updating = True
+        self.update_spectrogram(start, stop)
+        self.spectrogram_updating = False
+        ax.figure.canvas.draw_idle()
 
-            # Enable save button
-            self.save_button_state(True)
+    def plot_grms_table(self):
+        if self.data is None and self.stream_summary is None:
+            return
+        names = self.channel_names()
+        if self.stream_summary is not None:
+            freqs, psd_block = self.stream_summary.psd()
+        else:
+            # Gathered a page at a time, which keeps lazily read files within
+            # their resident channels and shares the PSD tab's cache entries
+            fs, params = self.sampling_frequency.get(), self.psd_params()
+            pages = [self.psd_cache.psd(self.data_source, self.data, self.page_channels(page), fs, **params) for page in range(self.num_pages())]
+            freqs, psd_block = pages[0][0], np.concatenate([page[1] for page in pages])
+            self.psd_cache_label.config(text=self.psd_cache.stats())
+        # No spectrum yet, or a record too short for more than one bin
+        if freqs is None or len(freqs) < 2:
+            return
+
+        # PSD in g^2/Hz; every channel and band is integrated in one call
+        sensitivity = self.sensitivity.get()
+        psd_block = psd_block / psd_block.dtype.type(sensitivity) ** 2
+        labels, lower, upper = self.grms_band_edges(freqs)
+        overall, bands = band_rms(freqs, psd_block, lower, upper)
+
+        self.grms_header = ["Channel", "Grms (g)"]
+        columns = [overall]
+        if self.stream_summary is not None:
+            # Time-domain statistics kept while the file was streamed
+            summary = self.stream_summary
+            self.grms_header += ["Mean (g)", "Std (g)", "Min (g)", "Max (g)"]
+            columns += [statistic / sensitivity for statistic in (summary.mean(), summary.std(), summary.minimum, summary.maximum)]
+        self.grms_header += labels
+        columns = np.column_stack(columns + [bands])
+        self.grms_rows = [[names[i]] + [float(value) for value in columns[i]] for i in range(len(names))]
+        self.fill_grms_table()
+        self.report_tables["grms"] = ("Grms and band levels (g rms)", self.grms_header,
+                                      [[row[0]] + ["{:.4g}".format(value) for value in row[1:]] for row in self.grms_rows])
+        self.save_button_state(True)
+
+    def fill_grms_table(self):
+        column, reverse = self.grms_sort
+        rows = self.grms_rows
+        if column is not None and column < len(self.grms_header):
+            rows = sorted(rows, key=lambda row: row[column], reverse=reverse)
+        ids = ["c{}".format(i) for i in range(len(self.grms_header))]
+        self.grms_table.delete(*self.grms_table.get_children())
+        self.grms_table["columns"] = ids
+        for i, (column_id, text) in enumerate(zip(ids, self.grms_header)):
+            self.grms_table.heading(column_id, text=text, command=lambda i=i: self.sort_grms_table(i))
+            self.grms_table.column(column_id, width=120 if i == 0 else 80, anchor="w" if i == 0 else "e", stretch=False)
+        for row in rows:
+            self.grms_table.insert("", "end", values=[row[0]] + ["{:.4g}".format(value) for value in row[1:]])
+
+    def sort_grms_table(self, column):
+        # Clicking a heading sorts by it, a second click reverses the order
+        reverse = self.grms_sort == (column, False)
+        self.grms_sort = (column, reverse)
+        self.fill_grms_table()
+
+    def compute_velocity_map(self):
+        # Per-bin levels and PSDs of every channel, kept until the files, the
+        # sampling frequency, the Welch settings or the bin count change;
+        # sensitivity is applied when drawing
+        fs, params = self.sampling_frequency.get(), self.psd_params()
+        num_bins = max(int(self.velocity_map_bins.get()), 1)
+        key = (self.data_source, id(self.data), id(self.velocity_data), fs, tuple(params.items()), num_bins)
+        if self.velocity_map_key != key:
+            velocity_time = self.velocity_data.time()
+            velocity_values = self.velocity_data.channel(0)
+            edges = velocity_bin_edges(velocity_values, num_bins)
+            bins = sample_bins(velocity_time, velocity_values, self.data.time, self.data.num_samples, edges)
+            rms, peak, psd = [], [], []
+            # A page of channels at a time keeps lazily read files resident
+            for page in range(self.num_pages()):
+                block = self.data.channels(self.page_channels(page))
+                page_rms, page_peak, counts = binned_levels(block, bins, num_bins)
+                freqs, page_psd, _ = binned_welch(block, fs, bins, num_bins, params["nperseg"], params["noverlap"],
+                                                         params["window"], params["detrend"])
+                rms.append(page_rms)
+                peak.append(page_peak)
+                psd.append(page_psd)
+            self.velocity_map = {"edges": edges, "counts": counts, "rms": np.concatenate(rms), "peak": np.concatenate(peak),
+                                 "freqs": freqs, "psd": np.concatenate(psd)}
+            self.velocity_map_key = key
+        return self.velocity_map
+
+    def plot_velocity_map(self):
+        if self.stream_summary is not None:
+            messagebox.showinfo("Velocity Map", "This file was too large to load and only its summaries were kept; the velocity map needs the full record.")
+            return
+        if self.data is None or self.velocity_data is None:
+            return
+        names = self.channel_names()
+        if self.velocity_map_channel.get() not in names:
+            self.velocity_map_channel.set(names[0])
+        self.velocity_map_channel_box["values"] = names
+        result = self.compute_velocity_map()
+        edges = result["edges"]
+        sensitivity = self.sensitivity.get()
+
+        cells, rebuilt = self.velocity_map_grid.ensure(tuple(names), lambda fig: self.build_velocity_map(fig, names))
+        heat_image, psd_image = cells[1], cells[3]
+        metric = self.velocity_map_metric.get()
+        levels = result[metric] / sensitivity
+        heat_image.set_data(levels)
+        heat_image.set_extent((edges[0], edges[-1], len(names) - 0.5, -0.5))
+        heat_image.set_clim(np.nanmin(levels), np.nanmax(levels))
+        cells[0].set_title("{} G-level by velocity (g)".format("RMS" if metric == "rms" else "Peak"), fontsize=10)
+
+        # Velocity x frequency map of the chosen channel, in dB
+        channel = names.index(self.velocity_map_channel.get())
+        freqs = result["freqs"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            level = 10 * np.log10(result["psd"][channel] / sensitivity ** 2)
+        half_bin = (freqs[1] - freqs[0]) / 2 if len(freqs) > 1 else 0.5
+        psd_image.set_data(level.T)
+        psd_image.set_extent((edges[0], edges[-1], freqs[0] - half_bin, freqs[-1] + half_bin))
+        peak = float(np.nanmax(level[np.isfinite(level)])) if np.isfinite(level).any() else 0.0
+        psd_image.set_clim(peak - VELOCITY_MAP_RANGE_DB, peak)
+        cells[2].set_title("PSD by velocity: {} (dB g^2/Hz)".format(names[channel]), fontsize=10)
+
+        self.velocity_map_grid.rescale()
+        self.velocity_map_grid.redraw(full=True)
+
+        image = io.BytesIO()
+        self.velocity_map_fig.savefig(image, format="png")
+        self.report_images[("velocity_map", None)] = image
+        self.save_button_state(True)
+
+    def build_velocity_map(self, fig, names):
+        # (heatmap axes, image, velocity-frequency axes, image); colour bars
+        # follow the images' limits
+        heat_ax = fig.add_subplot(1, 2, 1)
+        heat_image = heat_ax.imshow(np.zeros((1, 1)), aspect="auto", cmap="inferno", interpolation="nearest", extent=(0, 1, 1, 0))
+        fig.colorbar(heat_image, ax=heat_ax)
+        heat_ax.set_xlabel("Velocity")
+        heat_ax.set_ylabel("Channel")
+        if len(names) <= 32:
+            heat_ax.set_yticks(range(len(names)), names, fontsize=7)
+
+        psd_ax = fig.add_subplot(1, 2, 2)
+        psd_image = psd_ax.imshow(np.zeros((1, 1)), origin="lower", aspect="auto", cmap="viridis", interpolation="nearest", extent=(0, 1, 0, 1))
+        fig.colorbar(psd_image, ax=psd_ax)
+        psd_ax.set_xlabel("Velocity")
+        psd_ax.set_ylabel("Frequency (Hz)")
+        fig.subplots_adjust(wspace=0.3)
+        return [heat_ax, heat_image, psd_ax, psd_image]
+
+    def on_velocity_map_click(self, event):
+        # A click on a heatmap row shows that channel's PSD map
+        cells = self.velocity_map_grid.cells
+        if cells and event.inaxes is cells[0] and event.ydata is not None and self.data is not None:
+            names = self.channel_names()
+            channel = int(round(event.ydata))
+            if 0 <= channel < len(names):
+                self.velocity_map_channel.set(names[channel])
+                self.render_tab("velocity_map")
+
+    def plot_srs(self):
+        if self.stream_summary is not None:
+            messagebox.showinfo("SRS", "This file was too large to load and only its summaries were kept; an SRS needs the full record.")
+            return
+        if self.data is None:
+            return
+        self.srs_page = min(self.srs_page, self.num_pages() - 1)
+        channels = self.page_channels(self.srs_page)
+        self.srs_page_label.config(text=self.page_label(channels))
+
+        # Natural frequencies stop below the Nyquist frequency
+        fs, sensitivity = self.sampling_frequency.get(), self.sensitivity.get()
+        q, f_min, f_max, per_octave = self.srs_params()
+        freqs = srs_frequencies(f_min, f_max, per_octave)
+        freqs = freqs[freqs < fs / 2]
+        key = (self.data_source, id(self.data), fs, sensitivity, q, tuple(freqs), tuple(channels))
+        if key in self.srs_results:
+            self.srs_results.move_to_end(key)
+            self.draw_srs(channels, freqs, *self.srs_results[key])
+            return
+
+        self.srs_pending = key
+        self.srs_status.config(text="Computing SRS of {} channels at {} frequencies...".format(len(channels), len(freqs)))
+        if key in self.srs_computing:
+            # Still running from an earlier visit; its result is waited for
+            return
+        self.srs_computing.add(key)
+        data = self.data
+        self.srs_running += 1
+        threading.Thread(target=self.srs_worker, args=(key, data, channels, fs, sensitivity, freqs, q), daemon=True).start()
+        if not self.srs_polling:
+            self.srs_polling = True
+            self.root.after(100, self.poll_srs)
+
+    def srs_worker(self, key, data, channels, fs, sensitivity, freqs, q):
+        # Runs off the Tk thread: must not touch any widget or Tk variable
+        try:
+            block = data.channels(channels)
+            positive, negative = self.srs_engine.compute(block / block.dtype.type(sensitivity), fs, freqs, q)
+        except Exception as e:
+            self.srs_queue.put((key, None, str(e)))
+        else:
+            self.srs_queue.put((key, (freqs, positive, negative), None))
+
+    def poll_srs(self):
+        # Results of pages no longer waited for are only cached
+        try:
+            key, result, error = self.srs_queue.get_nowait()
+        except queue.Empty:
+            self.srs_polling = self.srs_running > 0
+            if self.srs_polling:
+                self.root.after(100, self.poll_srs)
+            return
+        self.srs_running -= 1
+        self.srs_computing.discard(key)
+        if error is not None:
+            self.srs_status.config(text="SRS failed: {}".format(error))
+        else:
+            freqs, positive, negative = result
+            self.srs_results[key] = (positive, negative)
+            while len(self.srs_results) > 8:
+                self.srs_results.popitem(last=False)
+            if key == self.srs_pending:
+                self.draw_srs(list(key[-1]), freqs, positive, negative)
+        if key == self.srs_pending:
+            self.srs_pending = None
+        self.root.after(100, self.poll_srs)
+
+    def draw_srs(self, channels, freqs, positive, negative):
+        # Maximax, positive and negative spectra of each channel on the page
+        names = self.channel_names()
+        num_plots = len(channels)
+        num_rows = (num_plots - 1) // 6 + 1
+        num_cols = min(num_plots, 6)
+        cells, rebuilt = self.srs_grid.ensure(num_plots, lambda fig: self.build_srs_grid(fig, num_plots, num_rows, num_cols))
+        retitled = False
+        for i, (ax, maximax_line, positive_line, negative_line) in enumerate(cells):
+            if ax.get_title() != names[channels[i]]:
+                ax.set_title(names[channels[i]], fontsize=8)
+                retitled = True
+            maximax_line.set_data(freqs, np.maximum(positive[i], negative[i]))
+            positive_line.set_data(freqs, positive[i])
+            negative_line.set_data(freqs, negative[i])
+        moved = self.srs_grid.rescale()
+        self.srs_grid.redraw(full=rebuilt or moved or retitled)
+        self.srs_status.config(text="SRS: Q = {:g}, {} natural frequencies from {:g} to {:g} Hz".format(
+            self.srs_params()[0], len(freqs), freqs[0], freqs[-1]) if len(freqs) else "SRS: no natural frequencies below Nyquist")
+
+        image = io.BytesIO()
+        self.srs_fig.savefig(image, format="png")
+        self.report_images[("srs", self.srs_page)] = image
+        self.save_button_state(True)
+
+    def build_srs_grid(self, fig, num_plots, num_rows, num_cols):
+        cells = []
+        for i in range(num_plots):
+            ax = fig.add_subplot(num_rows, num_cols, i + 1)
+            maximax_line, = ax.loglog([], [], label="Maximax", color='black')
+            positive_line, = ax.loglog([], [], label="Positive", color='tab:red', linewidth=0.8)
+            negative_line, = ax.loglog([], [], label="Negative", color='tab:blue', linewidth=0.8)
+            ax.set_xlabel("Natural frequency (Hz)", fontsize=8)
+            ax.set_ylabel("Peak accel (g)", fontsize=8)
+            ax.tick_params(axis='both', labelsize=7)
+            ax.tick_params(axis='y', which='minor', labelleft=False)
+            if i == 0:
+                ax.legend(loc='upper left', fontsize=6)
+            cells.append((ax, maximax_line, positive_line, negative_line))
+
+        # Adjust spacing between plot frames
+        fig.subplots_adjust(hspace=1, wspace=0.5, top=0.95)
+        return cells
+
+    def event_index_key(self):
+        # Identifies the event index wanted for the loaded file and settings;
+        # None while there is nothing to index or an entry is invalid
+        if self.data is None:
+            return None
+        try:
+            threshold, gap_ms = self.event_params()
+            return (self.data_source, id(self.data), self.sensitivity.get(), self.sampling_frequency.get(), threshold, gap_ms)
+        except (tk.TclError, ValueError):
+            return None
+
+    def start_event_index(self):
+        # Find the events of every channel on a worker thread, unless the
+        # index for the current file and settings exists or is being built
+        key = self.event_index_key()
+        if key is None or key == self.event_key or key == self.events_building:
+            return
+        _, _, sensitivity, fs, threshold, gap_ms = key
+        pages = [self.page_channels(page) for page in range(self.num_pages())]
+        self.events_building = key
+        self.events_running += 1
+        threading.Thread(target=self.event_worker, args=(key, self.data, pages, threshold * sensitivity, int(round(gap_ms * fs / 1000.0))),
+                         daemon=True).start()
+        if not self.events_polling:
+            self.events_polling = True
+            self.root.after(100, self.poll_events)
+
+    def event_worker(self, key, data, pages, threshold, gap):
+        # Runs off the Tk thread: must not touch any widget or Tk variable.
+        # One pass over the raw samples a page at a time; the pages are read
+        # without keeping them (keep=False), so a lazily read file keeps the
+        # pages on screen resident. Thresholds are scaled to raw units
+        # instead of scaling the samples.
+        try:
+            events = concatenate_events([exceedance_events(data.channels(channels, keep=False), threshold, gap, channels=channels)
+                                         for channels in pages])
+        except Exception as e:
+            self.events_queue.put((key, None, str(e)))
+        else:
+            self.events_queue.put((key, events, None))
+
+    def poll_events(self):
+        # Only the index for the current file and settings is kept
+        try:
+            key, events, error = self.events_queue.get_nowait()
+        except queue.Empty:
+            self.events_polling = self.events_running > 0
+            if self.events_polling:
+                self.root.after(100, self.poll_events)
+            return
+        self.events_running -= 1
+        if key == self.events_building:
+            self.events_building = None
+        if error is not None:
+            self.events_status.config(text="Event search failed: {}".format(error))
+        elif key == self.event_index_key():
+            self.event_index = events
+            self.event_key = key
+            self.render_tab("events")
+        self.root.after(100, self.poll_events)
+
+    def plot_events(self):
+        if self.stream_summary is not None:
+            messagebox.showinfo("Events", "This file was too large to load and only its summaries were kept; the event index needs the full record.")
+            return
+        if self.data is None:
+            return
+        if self.event_index_key() != self.event_key:
+            self.start_event_index()
+            self.events_status.config(text="Finding threshold exceedances of {} channels...".format(len(self.channel_names())))
+            return
+        self.event_listed = self.event_index
+        self.event_listed_key = self.event_key
+        self.fill_event_table()
+
+    def fill_event_table(self):
+        # Rows are sorted on the index arrays, so only the listed part of a
+        # long index is ever turned into text
+        events = self.event_listed
+        names = self.channel_names()
+        _, _, sensitivity, fs, threshold, gap_ms = self.event_listed_key
+        sort_keys = [(events["start"], events["channel"]), (events["channel"], events["start"]),
+                     (events["start"], events["stop"] - events["start"]), (events["start"], events["peak"]),
+                     (events["channel"], events["peak_index"])]
+        column, reverse = self.events_sort
+        order = np.lexsort(sort_keys[column if column is not None else 0])
+        if reverse:
+            order = order[::-1]
+        shown = order[:MAX_LISTED_EVENTS]
+
+        header = ["Channel", "Start (s)", "Duration (ms)", "Peak (g)", "Peak time (s)"]
+        ids = ["c{}".format(i) for i in range(len(header))]
+        self.events_table.delete(*self.events_table.get_children())
+        self.events_table["columns"] = ids
+        for i, (column_id, text) in enumerate(zip(ids, header)):
+            self.events_table.heading(column_id, text=text, command=lambda i=i: self.sort_event_table(i))
+            self.events_table.column(column_id, width=150 if i == 0 else 110, anchor="w" if i == 0 else "e", stretch=False)
+        start_time = self.data.time_at(events["start"][shown])
+        peak_time = self.data.time_at(events["peak_index"][shown])
+        duration = (events["stop"][shown] - events["start"][shown]) * 1000.0 / fs
+        peak = events["peak"][shown] / sensitivity
+        for row, event_id in enumerate(shown):
+            self.events_table.insert("", "end", iid=str(event_id), values=[
+                names[events["channel"][event_id]], "{:.6g}".format(start_time[row]), "{:.4g}".format(duration[row]),
+                "{:.4g}".format(peak[row]), "{:.6g}".format(peak_time[row])])
+
+        count = len(events["start"])
+        text = "{} events above {:g} g on {} of {} channels (gaps under {:g} ms merged)".format(
+            count, threshold, len(np.unique(events["channel"])), len(names), gap_ms)
+        if count > len(shown):
+            text += "; the first {} in this order are listed".format(len(shown))
+        self.events_status.config(text=text)
+
+    def sort_event_table(self, column):
+        # Clicking a heading sorts by it, a second click reverses the order
+        reverse = self.events_sort == (column, False)
+        self.events_sort = (column, reverse)
+        self.fill_event_table()
+
+    def step_event(self, step):
+        # Select the next or previous listed event and show it
+        rows = self.events_table.get_children()
+        if not rows:
+            messagebox.showinfo("Events", "No events are listed; open the Events tab to find threshold exceedances.")
+            return
+        selection = self.events_table.selection()
+        if selection:
+            position = min(max(rows.index(selection[0]) + step, 0), len(rows) - 1)
+        else:
+            position = 0 if step > 0 else len(rows) - 1
+        self.events_table.selection_set(rows[position])
+        self.events_table.see(rows[position])
+        self.show_event(int(rows[position]))
+
+    def show_selected_event(self):
+        selection = self.events_table.selection()
+        if selection:
+            self.show_event(int(selection[0]))
+
+    def show_event(self, event_id):
+        # Zoom the G-level view to one event: its page is brought up and the
+        # channel's axes are limited to the event, which the min/max pyramid
+        # re-decimates without scanning the samples again. Thumbnail and
+        # density grids have no trace to zoom, so the zoom window is used.
+        if self.data is None or self.event_listed_key[:2] != (self.data_source, id(self.data)):
+            messagebox.showinfo("Events", "The event list belongs to another file; open the Events tab to refresh it.")
+            return
+        events = self.event_listed
+        channel, start, stop = (int(events[field][event_id]) for field in ("channel", "start", "stop"))
+        self.glevel_page = channel // CHANNELS_PER_PAGE
+        if self.selected_tab() != "glevel":
+            self.notebook.select(self.glevel_plots_frame)
+        self.render_tab("glevel")
+
+        # The event with its own length again on either side, at least 100 samples
+        margin = max(stop - start, 100)
+        window = self.data.time_at(np.array([max(start - margin, 0), min(stop + margin, self.data.num_samples - 1)]))
+        axes = [ax for ax, entry in self.glevel_lines.items() if entry[2] == channel]
+        if axes:
+            axes[0].set_xlim(*window)
+        elif self.velocity_data is not None:
+            self.glevel_plot_index = channel
+            self.zoom_glevel_plot()
+            self.detail_windows[("glevel", channel)]["fig"].axes[0].set_xlim(*window)
 
     def save_button_state(self, state):
         if state:
@@ -219,10 +1897,20 @@ class VibrationAnalyzer:
             self.save_button.grid_remove()
 
     def save_images(self):
-        if self.image_filenames:
+        if self.report_images or self.report_tables:
             doc = Document()
-            for filename in self.image_filenames:
-                doc.add_picture(filename, width=Inches(6))
+            for image in self.report_images.values():
+                image.seek(0)
+                doc.add_picture(image, width=Inches(6))
+                doc.add_paragraph()
+            for title, header, rows in self.report_tables.values():
+                doc.add_paragraph(title)
+                table = doc.add_table(rows=1, cols=len(header), style="Table Grid")
+                for cell, text in zip(table.rows[0].cells, header):
+                    cell.text = text
+                for row in rows:
+                    for cell, text in zip(table.add_row().cells, row):
+                        cell.text = text
                 doc.add_paragraph()
             save_path = filedialog.asksaveasfilename(defaultextension=".docx", filetypes=[("Word files", "*.docx")])
             if save_path:
@@ -233,56 +1921,116 @@ class VibrationAnalyzer:
 
     def on_glevel_plot_click(self, event):
         if event.inaxes and event.inaxes.get_figure() == self.glevel_fig:
-            for i, ax in enumerate(self.glevel_fig.axes):
-                if ax == event.inaxes:
-                    self.glevel_plot_index = i
-                    break
-
-            if self.glevel_plot_index is not None:
+            # Axes are reused across pages, so look up the channel they show
+            if event.inaxes in self.glevel_axes_channels:
+                self.glevel_plot_index = self.glevel_axes_channels[event.inaxes]
                 self.zoom_glevel_plot()
 
+    def detail_window(self, key, title, signature, draw):
+        # Zoom window for key = (view, channel), drawn with the Figure API.
+        # Windows are hidden rather than destroyed when closed, so clicking
+        # the same plot again just shows it; it is only redrawn when its
+        # signature (data and settings it depends on) has changed.
+        entry = self.detail_windows.get(key)
+        if entry is None:
+            window = tk.Toplevel(self.root)
+            fig = Figure(figsize=(10, 5))
+            canvas = FigureCanvasTkAgg(fig, window)
+            toolbar = NavigationToolbar2Tk(canvas, window)
+            toolbar.update()
+            canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
+            window.protocol("WM_DELETE_WINDOW", window.withdraw)
+            entry = {"window": window, "fig": fig, "canvas": canvas, "toolbar": toolbar, "signature": None}
+            self.detail_windows[key] = entry
+            while len(self.detail_windows) > MAX_DETAIL_WINDOWS:
+                _, old = self.detail_windows.popitem(last=False)
+                for ax in old["fig"].axes:
+                    self.detail_lines.pop(ax, None)
+                old["window"].destroy()
+        else:
+            self.detail_windows.move_to_end(key)
+
+        entry["window"].title(title)
+        if entry["signature"] != signature:
+            fig = entry["fig"]
+            for ax in fig.axes:
+                self.detail_lines.pop(ax, None)
+            fig.clf()
+            draw(fig)
+            entry["canvas"].draw()
+            entry["toolbar"].update()
+            entry["signature"] = signature
+
+            # The report gets the latest version of each view, kept in memory
+            image = io.BytesIO()
+            fig.savefig(image, format="png")
+            self.report_images[key] = image
+            self.save_button_state(True)
+        entry["window"].deiconify()
+        entry["window"].lift()
+
     def zoom_glevel_plot(self):
         if self.glevel_plot_index is not None:
-            plt.figure()
-            channel = self.data.columns[self.glevel_plot_index + 1]  # Exclude time column
-            plt.plot(self.velocity_data.iloc[:, 0], self.velocity_data.iloc[:, 1], label="Velocity", color='orange')  # Use velocity profile from the first channel
-            plt.plot(self.data.iloc[:, 0], self.data.iloc[:, self.glevel_plot_index + 1] / self.sensitivity.get(), label="G-levels", color='blue')
-            plt.title(channel)
-            plt.xlabel("Time (s)")
-            plt.ylabel("Values")
-            plt.legend()
-            image_filename = "glevel_{}.png".format(channel)
-            plt.savefig(image_filename)
-            plt.close()
-            self.image_filenames.append(image_filename)
+            channel = self.glevel_plot_index
+            signature = (self.data_source, id(self.data), id(self.stream_summary), id(self.velocity_data),
+                         self.sensitivity.get(), self.glevel_decimation.get())
+            self.detail_window(("glevel", channel), self.channel_names()[channel], signature, lambda fig: self.draw_glevel_detail(fig, channel))
+
+    def draw_glevel_detail(self, fig, channel):
+        # Full-length trace of one channel over the shared velocity overlay;
+        # toolbar zoom and pan re-decimate like the line grid
+        pixels = self.subplot_pixels(fig, 1)
+        ax = fig.add_subplot(1, 1, 1)
+        if self.stream_summary is not None:
+            env_time, env_min, env_max = self.stream_summary.envelope()
+            ax.fill_between(env_time, env_min[channel] / self.sensitivity.get(), env_max[channel] / self.sensitivity.get(), label="G-levels", color='blue')
+        else:
+            channels = self.glevel_channels if channel in self.glevel_channels else [channel]
+            row = channels.index(channel)
+            if self.glevel_decimation.get() == "lttb":
+                indices, trace = decimate(self.data.channel(channel), pixels, "lttb")
+            else:
+                indices, trace = self.glevel_levels(channels).query([row], 0, self.data.num_samples, pixels)
+            line, = ax.plot(self.data.time_at(indices[0]), trace[0] / trace.dtype.type(self.sensitivity.get()), label="G-levels", color='blue')
+            self.detail_lines[ax] = (channels, row, channel, line)
+            ax.callbacks.connect('xlim_changed', self.on_glevel_xlim_changed)
+        ax2 = ax.twinx()
+        ax2.plot(*self.velocity_overlay(pixels), label="Velocity", color='orange')
+        ax.set_title(self.channel_names()[channel])
+        ax.set_xlabel("Time (s)")
+        ax.set_ylabel("G-levels")
+        ax2.set_ylabel("Velocity")
+        ax.legend(loc='upper left')
+        ax2.legend(loc='upper right')
 
     def on_psd_plot_click(self, event):
         if event.inaxes and event.inaxes.get_figure() == self.psd_fig:
-            for i, ax in enumerate(self.psd_fig.axes):
-                if ax == event.inaxes:
-                    self.psd_plot_index = i
-                    break
-
-            if self.psd_plot_index is not None:
+            if event.inaxes in self.psd_axes_channels:
+                self.psd_plot_index = self.psd_axes_channels[event.inaxes]
                 self.zoom_psd_plot()
 
     def zoom_psd_plot(self):
         if self.psd_plot_index is not None:
-            plt.figure()
-            channel = self.data.columns[self.psd_plot_index + 1]  # Exclude time column
-
-            # Calculate PSD using Welch method
-            f, p_s_d = welch(self.data.iloc[:, self.psd_plot_index + 1], fs=self.sampling_frequency.get())
-
-            plt.semilogy(f, p_s_d)
-            plt.title(channel)
-            plt.xlabel("Frequency (Hz)")
-            plt.ylabel("PSD")
-            plt.legend()
-            image_filename = "psd_{}.png".format(channel)
-            plt.savefig(image_filename)
-            plt.close()
-            self.image_filenames.append(image_filename)
+            channel = self.psd_plot_index
+            signature = (self.data_source, id(self.data), id(self.stream_summary),
+                         self.sampling_frequency.get(), tuple(self.psd_params().items()))
+            self.detail_window(("psd", channel), self.channel_names()[channel], signature, lambda fig: self.draw_psd_detail(fig, channel))
+
+    def draw_psd_detail(self, fig, channel):
+        # Calculate PSD using Welch method
+        if self.stream_summary is not None:
+            f, p_s_d = self.stream_summary.psd()
+            p_s_d = p_s_d[channel]
+        else:
+            f, p_s_d = self.psd_cache.psd(self.data_source, self.data, [channel], self.sampling_frequency.get(), **self.psd_params())
+            p_s_d = p_s_d[0]
+            self.psd_cache_label.config(text=self.psd_cache.stats())
+
+        ax = fig.add_subplot(1, 1, 1)
+        ax.semilogy(f, p_s_d)
+        ax.set_title(self.channel_names()[channel])
+        ax.set_xlabel("Frequency (Hz)")
+        ax.set_ylabel("PSD")
 
 
 if __name__ == "__main__":
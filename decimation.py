@@ -0,0 +1,227 @@
+import numpy as np
+
+
+def minmax_decimate(block, num_buckets, start=0):
+    # Reduce every row of block (channels, samples) to the minimum and maximum
+    # of each of num_buckets equal buckets, kept in time order, so every peak
+    # of the raw trace survives. Returns (indices, values), both shaped
+    # (channels, ~2 * num_buckets); indices are sample numbers offset by start.
+    block = np.atleast_2d(block)
+    num_channels, num_samples = block.shape
+    if num_samples <= 2 * num_buckets:
+        indices = np.broadcast_to(np.arange(num_samples) + start, block.shape)
+        return np.array(indices), np.array(block)
+
+    # Rounding the bucket size up keeps the leftover shorter than one bucket
+    bucket = -(-num_samples // num_buckets)
+    num_buckets = num_samples // bucket
+    whole = num_buckets * bucket
+    buckets = block[:, :whole].reshape(num_channels, num_buckets, bucket)
+    lows = buckets.argmin(axis=2)
+    highs = buckets.argmax(axis=2)
+    first = np.minimum(lows, highs)
+    second = np.maximum(lows, highs)
+    offsets = np.arange(num_buckets) * bucket
+    indices = np.stack([first + offsets, second + offsets], axis=2).reshape(num_channels, -1)
+
+    # Samples left over after the last whole bucket form one more bucket
+    if whole < num_samples:
+        tail = block[:, whole:]
+        tail_indices = np.sort(np.stack([tail.argmin(axis=1), tail.argmax(axis=1)], axis=1), axis=1) + whole
+        indices = np.concatenate([indices, tail_indices], axis=1)
+
+    values = np.take_along_axis(block, indices, axis=1)
+    return indices + start, values
+
+
+def resample_decimate(time_values, values, target_time, num_samples, num_buckets, chunk=1 << 20):
+    # Interpolate a (time_values, values) series onto the sample times of
+    # another record and min/max decimate the result to num_buckets, one
+    # chunk of whole buckets at a time so the resampled series is never held
+    # in full. target_time(start, stop) returns that record's sample times.
+    # Returns (indices, values) shaped (1, ~2 * num_buckets) like minmax_decimate.
+    if num_samples <= 2 * num_buckets:
+        resampled = np.interp(target_time(0, num_samples), time_values, values)
+        return minmax_decimate(resampled, num_buckets)
+    bucket = -(-num_samples // num_buckets)
+    step = max(chunk // bucket, 1) * bucket
+    parts = []
+    for start in range(0, num_samples, step):
+        stop = min(start + step, num_samples)
+        resampled = np.interp(target_time(start, stop), time_values, values)
+        parts.append(minmax_decimate(resampled, -(-(stop - start) // bucket), start))
+    return np.concatenate([part[0] for part in parts], axis=1), np.concatenate([part[1] for part in parts], axis=1)
+
+
+def lttb_decimate(block, num_points, start=0):
+    # Largest-triangle-three-buckets selection of num_points samples per row,
+    # stepping through the buckets once and handling all channels together.
+    # Keeps the visual shape of smooth traces but, unlike min/max, does not
+    # guarantee that every peak is kept.
+    block = np.atleast_2d(block)
+    num_channels, num_samples = block.shape
+    if num_samples <= num_points or num_points < 3:
+        indices = np.broadcast_to(np.arange(num_samples) + start, block.shape)
+        return np.array(indices), np.array(block)
+
+    rows = np.arange(num_channels)
+    edges = np.linspace(1, num_samples - 1, num_points - 1).astype(np.int64)
+    indices = np.zeros((num_channels, num_points), dtype=np.int64)
+    indices[:, -1] = num_samples - 1
+    selected = np.zeros(num_channels, dtype=np.int64)
+
+    for k in range(num_points - 2):
+        lo, hi = edges[k], max(edges[k + 1], edges[k] + 1)
+        next_hi = edges[k + 2] if k + 2 < len(edges) else num_samples
+        next_lo = hi if hi < next_hi else next_hi - 1
+        # Third vertex: the average point of the next bucket
+        avg_x = (next_lo + next_hi - 1) / 2.0
+        avg_y = block[:, next_lo:next_hi].mean(axis=1)
+
+        ax = selected.astype(np.float64)
+        ay = block[rows, selected].astype(np.float64)
+        x = np.arange(lo, hi, dtype=np.float64)
+        y = block[:, lo:hi]
+        area = np.abs((ax[:, None] - avg_x) * (y - ay[:, None]) - (ax[:, None] - x) * (avg_y - ay)[:, None])
+        selected = lo + area.argmax(axis=1)
+        indices[:, k + 1] = selected
+
+    values = np.take_along_axis(block, indices, axis=1)
+    return indices + start, values
+
+
+def decimate(block, pixels, mode="minmax", start=0):
+    # About two output points per horizontal pixel, whichever method is used
+    if mode == "lttb":
+        return lttb_decimate(block, 2 * pixels, start)
+    return minmax_decimate(block, pixels, start)
+
+
+class MinMaxPyramid:
+    # Multi-resolution min/max summary of a (channels, samples) block, built
+    # once. Level k holds, for every bucket of base * factor**k samples, the
+    # sample indices of each channel's minimum and maximum, so any time window
+    # can be reduced to screen resolution from the coarsest level that is
+    # still fine enough, and windows short enough are served from the raw
+    # samples exactly.
+    def __init__(self, block, base=64, factor=4):
+        self.block = np.atleast_2d(block)
+        self.levels = []
+        num_channels, num_samples = self.block.shape
+
+        bucket = base
+        if num_samples < 2 * bucket:
+            return
+        whole = num_samples // bucket * bucket
+        buckets = self.block[:, :whole].reshape(num_channels, -1, bucket)
+        offsets = np.arange(buckets.shape[1]) * bucket
+        low = buckets.argmin(axis=2) + offsets
+        high = buckets.argmax(axis=2) + offsets
+        low_values = np.take_along_axis(self.block, low, axis=1)
+        high_values = np.take_along_axis(self.block, high, axis=1)
+        self.levels.append((bucket, low, high, low_values, high_values))
+
+        # Each further level reduces groups of `factor` buckets of the previous one
+        while low.shape[1] >= 2 * factor:
+            bucket *= factor
+            whole = low.shape[1] // factor * factor
+            rows = np.arange(num_channels)[:, None]
+            groups = low_values[:, :whole].reshape(num_channels, -1, factor)
+            pick = groups.argmin(axis=2) + np.arange(groups.shape[1]) * factor
+            low, low_values = low[rows, pick], low_values[rows, pick]
+            groups = high_values[:, :whole].reshape(num_channels, -1, factor)
+            pick = groups.argmax(axis=2) + np.arange(groups.shape[1]) * factor
+            high, high_values = high[rows, pick], high_values[rows, pick]
+            self.levels.append((bucket, low, high, low_values, high_values))
+
+    def limits(self):
+        # Exact per-row (minimum, maximum): the coarsest level plus the
+        # samples after its last whole bucket
+        if not self.levels:
+            return self.block.min(axis=1), self.block.max(axis=1)
+        bucket, low, high, low_values, high_values = self.levels[-1]
+        lo, hi = low_values.min(axis=1), high_values.max(axis=1)
+        covered = low.shape[1] * bucket
+        if covered < self.block.shape[1]:
+            lo = np.minimum(lo, self.block[:, covered:].min(axis=1))
+            hi = np.maximum(hi, self.block[:, covered:].max(axis=1))
+        return lo, hi
+
+    def query(self, channels, start, stop, pixels):
+        # (indices, values) for the given channel rows over samples [start, stop),
+        # at about two points per pixel
+        start = max(int(start), 0)
+        stop = min(int(stop), self.block.shape[1])
+        if stop <= start:
+            return np.zeros((len(channels), 0), dtype=np.int64), np.zeros((len(channels), 0), dtype=self.block.dtype)
+
+        wanted = (stop - start) / max(pixels, 1)
+        level = None
+        for candidate in self.levels:
+            if candidate[0] <= wanted:
+                level = candidate
+        if level is None:
+            # Fine enough to decimate the raw samples directly
+            return minmax_decimate(self.block[channels, start:stop], pixels, start)
+
+        bucket, low, high, low_values, high_values = level
+        first = start // bucket
+        last = min(-(-stop // bucket), low.shape[1])
+        low, high = low[channels, first:last], high[channels, first:last]
+        low_values, high_values = low_values[channels, first:last], high_values[channels, first:last]
+        # Interleave each bucket's min and max in time order
+        low_first = low <= high
+        indices = np.stack([np.where(low_first, low, high), np.where(low_first, high, low)], axis=2)
+        values = np.stack([np.where(low_first, low_values, high_values), np.where(low_first, high_values, low_values)], axis=2)
+        indices = indices.reshape(len(channels), -1)
+        values = values.reshape(len(channels), -1)
+
+        # Samples after the last whole bucket of this level come from the raw data
+        covered = low.shape[1] and (first + low.shape[1]) * bucket
+        if covered and covered < stop:
+            tail_indices, tail_values = minmax_decimate(self.block[channels, covered:stop], 1, covered)
+            indices = np.concatenate([indices, tail_indices], axis=1)
+            values = np.concatenate([values, tail_values], axis=1)
+
+        if values.shape[1] > 2 * pixels:
+            # Merge neighbouring buckets down to the pixel budget
+            keep, values = minmax_decimate(values, pixels)
+            indices = np.take_along_axis(indices, keep, axis=1)
+        return indices, values
+
+
+def density_histogram(block, width, height, limits=None, chunk=1 << 18):
+    # Counts of samples per (amplitude, time) cell of a width x height image
+    # for every row of block, in one pass over the samples: the time bin comes
+    # from the sample index, the amplitude bin from the value within limits
+    # (per-row (lo, hi) arrays, default the row minimum and maximum), and all
+    # rows are counted together with a single bincount per chunk.
+    # Returns (counts (channels, height, width), lo, hi).
+    block = np.atleast_2d(block)
+    num_channels, num_samples = block.shape
+    if limits is None:
+        lo, hi = block.min(axis=1).astype(np.float64), block.max(axis=1).astype(np.float64)
+    else:
+        lo, hi = (np.asarray(limit, dtype=np.float64) for limit in limits)
+    span = np.where(hi > lo, hi - lo, 1.0)
+
+    # Amplitude bins are computed in the sample precision as value * scale + offset
+    dtype = np.result_type(block.dtype, np.float32)
+    scale = (height / span).astype(dtype)[:, None]
+    offset = (-lo * height / span).astype(dtype)[:, None]
+    size = num_channels * height * width
+    index_type = np.int32 if size < 2 ** 31 else np.int64
+    counts = np.zeros(size, dtype=np.int64)
+    row_offset = (np.arange(num_channels, dtype=index_type) * height * width)[:, None]
+    for start in range(0, num_samples, chunk):
+        values = block[:, start:start + chunk]
+        columns = (np.arange(start, start + values.shape[1], dtype=np.int64) * width // max(num_samples, 1)).astype(index_type)
+        scaled = values * scale
+        scaled += offset
+        np.clip(scaled, 0, height - 1, out=scaled)
+        cells = scaled.astype(index_type)
+        cells *= width
+        cells += columns
+        cells += row_offset
+        counts += np.bincount(cells.ravel(), minlength=size)
+    return counts.reshape(num_channels, height, width), lo, hi
@@ -0,0 +1,117 @@
+import numpy as np
+
+# Fields of an event index, each an array with one entry per event
+EVENT_FIELDS = ("channel", "start", "stop", "peak_index", "peak")
+
+
+def exceedance_events(block, threshold, min_gap=0, chunk=1 << 20, channels=None):
+    # Every run of samples with |value| > threshold in every row of block
+    # (channels, samples), found in one vectorised pass per chunk: the run
+    # edges of all rows come from one diff of the exceedance mask, and the
+    # peak of each run from one reduceat over the exceeding samples. Runs
+    # still open at the end of a chunk continue into the next. Runs of a
+    # channel less than min_gap samples apart are merged into one event.
+    # Returns a dict of EVENT_FIELDS arrays (stop exclusive, peak the largest
+    # |value|), sorted by channel and start; channels relabels the rows.
+    block = np.atleast_2d(block)
+    num_channels, num_samples = block.shape
+    found = {field: [] for field in EVENT_FIELDS}
+    # Run of each row still open at the end of the previous chunk, if any
+    open_start = np.full(num_channels, -1, dtype=np.int64)
+    open_peak = np.zeros(num_channels)
+    open_index = np.zeros(num_channels, dtype=np.int64)
+
+    for offset in range(0, num_samples, chunk):
+        magnitude = np.abs(block[:, offset:offset + chunk])
+        width = magnitude.shape[1]
+        mask = magnitude > threshold
+        padded = np.zeros((num_channels, width + 2), dtype=np.int8)
+        padded[:, 1:-1] = mask
+        edges = np.diff(padded, axis=1)
+        # Starts and stops pair up in row-major order
+        run_rows, run_starts = np.nonzero(edges == 1)
+        _, run_stops = np.nonzero(edges == -1)
+
+        # A run open since the last chunk ends here unless it carries on at
+        # the first sample
+        ended = (open_start >= 0) & ~mask[:, 0]
+        for field, values in zip(EVENT_FIELDS, (np.flatnonzero(ended), open_start[ended], np.full(ended.sum(), offset),
+                                                open_index[ended], open_peak[ended])):
+            found[field].append(values)
+        open_start[ended] = -1
+
+        if len(run_rows):
+            positions = np.flatnonzero(mask)
+            values = magnitude.ravel()[positions]
+            first = np.searchsorted(positions, run_rows * width + run_starts)
+            peaks = np.maximum.reduceat(values, first)
+            # Position of each run's peak: its first sample equal to the peak
+            run_of = np.repeat(np.arange(len(first)), np.diff(np.append(first, len(positions))))
+            hits = np.flatnonzero(values == peaks[run_of])
+            _, first_hit = np.unique(run_of[hits], return_index=True)
+            peak_index = positions[hits[first_hit]] - run_rows * width + offset
+            starts = run_starts + offset
+            stops = run_stops + offset
+
+            # Runs starting at sample 0 continue an open run of the same row
+            continued = (run_starts == 0) & (open_start[run_rows] >= 0)
+            rows = run_rows[continued]
+            starts[continued] = open_start[rows]
+            larger = open_peak[rows] >= peaks[continued]
+            peak_index[continued] = np.where(larger, open_index[rows], peak_index[continued])
+            peaks[continued] = np.maximum(open_peak[rows], peaks[continued])
+            open_start[rows] = -1
+
+            # Runs reaching the end of the chunk stay open, unless it is the last
+            still_open = (run_stops == width) & (offset + width < num_samples)
+            rows = run_rows[still_open]
+            open_start[rows] = starts[still_open]
+            open_peak[rows] = peaks[still_open]
+            open_index[rows] = peak_index[still_open]
+
+            closed = ~still_open
+            for field, values in zip(EVENT_FIELDS, (run_rows[closed], starts[closed], stops[closed], peak_index[closed], peaks[closed])):
+                found[field].append(values)
+
+    events = {field: np.concatenate(found[field]) if found[field] else np.zeros(0) for field in EVENT_FIELDS}
+    for field in ("channel", "start", "stop", "peak_index"):
+        events[field] = events[field].astype(np.int64)
+    events["peak"] = events["peak"].astype(np.float64)
+    order = np.lexsort((events["start"], events["channel"]))
+    events = {field: values[order] for field, values in events.items()}
+    events = merge_events(events, min_gap)
+    if channels is not None:
+        events["channel"] = np.asarray(channels, dtype=np.int64)[events["channel"]]
+    return events
+
+
+def merge_events(events, min_gap):
+    # Join events of the same channel separated by fewer than min_gap samples
+    if min_gap <= 0 or len(events["start"]) < 2:
+        return events
+    channel, start, stop = events["channel"], events["start"], events["stop"]
+    new = np.ones(len(start), dtype=bool)
+    new[1:] = (channel[1:] != channel[:-1]) | (start[1:] - stop[:-1] >= min_gap)
+    first = np.flatnonzero(new)
+    last = np.append(first[1:], len(start)) - 1
+    peaks = np.maximum.reduceat(events["peak"], first)
+    group = np.cumsum(new) - 1
+    # Earliest event of each group holding the group's peak
+    holders = np.flatnonzero(events["peak"] == peaks[group])
+    _, first_holder = np.unique(group[holders], return_index=True)
+    return {
+        "channel": channel[first],
+        "start": start[first],
+        "stop": stop[last],
+        "peak_index": events["peak_index"][holders[first_holder]],
+        "peak": peaks,
+    }
+
+
+def concatenate_events(parts):
+    # One index from the indexes of several groups of channels
+    if not parts:
+        return {field: np.zeros(0, dtype=np.float64 if field == "peak" else np.int64) for field in EVENT_FIELDS}
+    events = {field: np.concatenate([part[field] for part in parts]) for field in EVENT_FIELDS}
+    order = np.lexsort((events["start"], events["channel"]))
+    return {field: values[order] for field, values in events.items()}
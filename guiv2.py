@@ -44,6 +44,20 @@ class PSDPlotterApp:
         self.sensitivity_entry = Entry(self.root, state="disabled")
         self.sensitivity_entry.pack()
 
+        # Entry for sampling frequency
+        self.fs_label = tk.Label(self.root, text="Sampling Frequency (Hz): ", bg="#f0f8ff")
+        self.fs_label.pack()
+        self.fs_entry = Entry(self.root)
+        self.fs_entry.insert(0, "1.0")
+        self.fs_entry.pack()
+
+        # Entry for Welch segment length
+        self.nperseg_label = tk.Label(self.root, text="Segment Length (samples): ", bg="#f0f8ff")
+        self.nperseg_label.pack()
+        self.nperseg_entry = Entry(self.root)
+        self.nperseg_entry.insert(0, "1024")
+        self.nperseg_entry.pack()
+
         # Plot Button
         self.plot_button = tk.Button(self.root, text="Plot PSD", command=self.plot_psd, bg="#87ceeb")
         self.plot_button.pack(pady=10)
@@ -75,7 +89,12 @@ class PSDPlotterApp:
             return
 
         data = self.df.iloc[:, 1]  # Assuming the data is in the second column, change as needed
-        fs = 1.0  # Adjust this value based on your data
+        try:
+            fs = float(self.fs_entry.get())
+            nperseg = int(self.nperseg_entry.get())
+        except ValueError:
+            tk.messagebox.showerror("Error", "Please enter numeric values for sampling frequency and segment length.")
+            return
 
         sensitivity = None
         if self.sensitivity_var.get() == 1:
@@ -87,7 +106,7 @@ class PSDPlotterApp:
                 return
 
         n = len(data)
-        f, Pxx = self.calculate_psd(data, fs, n, sensitivity)
+        f, Pxx = self.calculate_psd(data, fs, n, sensitivity, nperseg)
 
         self.ax.clear()
         self.ax.semilogy(f, Pxx)
@@ -100,8 +119,8 @@ class PSDPlotterApp:
 
         self.canvas.draw()
 
-    def calculate_psd(self, data, fs, n, sensitivity=None):
-        f, Pxx = welch(data, fs, nperseg=1024)
+    def calculate_psd(self, data, fs, n, sensitivity=None, nperseg=1024):
+        f, Pxx = welch(data, fs, nperseg=min(nperseg, n))
         if sensitivity is not None:
             Pxx = 10 * np.log10(Pxx / (sensitivity**2))  # Convert to dB re: (Hz/V)^2
         return f, Pxx
@@ -0,0 +1,66 @@
+class PlotGrid:
+    # A persistent grid of subplots on one embedded figure. The axes, twin
+    # axes, titles, labels, legends and tick formatting are only built when
+    # the layout changes (other channels, another kind of plot); re-plots
+    # update the existing artists in place and then redraw as little as
+    # possible: if no axis limits moved, only the inside of every axes is
+    # repainted and blitted, otherwise the canvas is redrawn once.
+    def __init__(self, fig, canvas, toolbar=None):
+        self.fig = fig
+        self.canvas = canvas
+        self.toolbar = toolbar
+        self.layout = None
+        self.cells = []
+        self.drawn = False
+        canvas.mpl_connect('draw_event', self.on_draw)
+
+    def on_draw(self, event):
+        # A renderer exists once the figure has been drawn in full
+        self.drawn = True
+
+    def ensure(self, layout, build):
+        # Returns the cells for layout, calling build(fig) -> cells only when
+        # the layout differs from the one on the figure
+        if layout == self.layout:
+            return self.cells, False
+        self.fig.clf()
+        self.cells = build(self.fig)
+        self.layout = layout
+        self.drawn = False
+        return self.cells, True
+
+    def reset(self):
+        # Forget the layout so the next ensure() builds the grid again
+        self.layout = None
+
+    def rescale(self):
+        # Recompute every axis' data limits after set_data and autoscale to
+        # them, as a freshly built plot would; True if any limits moved
+        moved = False
+        for ax in self.fig.axes:
+            before = (ax.get_xlim(), ax.get_ylim())
+            ax.set_autoscale_on(True)
+            ax.relim()
+            ax.autoscale_view()
+            moved = moved or before != (ax.get_xlim(), ax.get_ylim())
+        if self.toolbar is not None:
+            # Zoom history refers to the previous data
+            self.toolbar.update()
+        return moved
+
+    def redraw(self, full=False):
+        if full or not self.drawn or not getattr(self.canvas, "supports_blit", False):
+            self.canvas.draw()
+            return
+        # Repaint the background and data of each axes in stacking order,
+        # then blit only the axes areas to the screen
+        for ax in self.fig.axes:
+            artists = [ax.patch] + list(ax.images) + list(ax.collections) + list(ax.lines)
+            if ax.axison:
+                artists += list(ax.spines.values())
+            if ax.get_legend() is not None:
+                artists.append(ax.get_legend())
+            for artist in artists:
+                ax.draw_artist(artist)
+        for ax in self.fig.axes:
+            self.canvas.blit(ax.bbox)
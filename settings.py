@@ -0,0 +1,66 @@
+import os
+import json
+
+# User settings persisted between sessions
+SETTINGS_PATH = os.path.join(os.path.expanduser("~"), ".vibration_analyzer.json")
+
+DEFAULTS = {
+    "glevel": {
+        "decimation": "minmax",  # or "lttb"
+        "render": "lines",  # "thumbnails" or "density"
+        "velocity": "twin",  # or "strip", one shared axis under the grid
+    },
+    "psd": {
+        "nperseg": 256,
+        "overlap": 50.0,  # percent of the segment length
+        "window": "hann",
+        "detrend": "constant",
+        "average": "mean",
+    },
+    "spectrogram": {
+        "nperseg": 1024,
+        "overlap": 50.0,  # percent of the segment length
+        "window": "hann",
+        "range": 80.0,  # dB shown below each channel's peak
+    },
+    "grms": {
+        "bands": "1/3 octave",  # or Hz ranges such as "20-100, 100-500"
+    },
+    "velocity_map": {
+        "bins": 20,
+        "metric": "rms",  # or "peak"
+    },
+    "srs": {
+        "q": 10.0,
+        "f_min": 10.0,
+        "f_max": 2000.0,
+        "per_octave": 12,
+    },
+    "events": {
+        "threshold": 5.0,  # g, on |value|
+        "gap_ms": 10.0,  # exceedances closer than this are one event
+    },
+}
+
+
+def load_settings():
+    settings = json.loads(json.dumps(DEFAULTS))
+    try:
+        with open(SETTINGS_PATH) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        return settings
+    for section, values in saved.items():
+        if isinstance(values, dict) and section in settings:
+            settings[section].update(values)
+        else:
+            settings[section] = values
+    return settings
+
+
+def save_settings(settings):
+    try:
+        with open(SETTINGS_PATH, "w") as f:
+            json.dump(settings, f, indent=2)
+    except OSError:
+        pass
@@ -0,0 +1,378 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft
+from scipy.integrate import cumulative_trapezoid
+from scipy.signal import get_window
+
+# Upper bound on the samples held in one batch of windowed segments
+BATCH_SAMPLES = 1 << 23
+
+
+class WelchPlan:
+    # Everything about a Welch estimate that does not depend on the samples:
+    # segment start indices, window, density scale, frequency axis, the ramp
+    # used for linear detrending and the median bias. Plans are memoised by
+    # welch_plan, so switching back to a resolution reuses its arrays.
+    def __init__(self, num_samples, fs, nperseg, noverlap, window, dtype):
+        self.nperseg = min(nperseg, num_samples)
+        self.noverlap = self.nperseg // 2 if noverlap is None else min(noverlap, self.nperseg - 1)
+        self.step = self.nperseg - self.noverlap
+        self.num_segments = (num_samples - self.noverlap) // self.step
+        self.starts = np.arange(self.num_segments) * self.step
+
+        window_values = get_window(window, self.nperseg)
+        self.window = window_values.astype(dtype)
+        self.scale = 1.0 / (fs * float(np.sum(window_values ** 2)))
+        self.freqs = fft.rfftfreq(self.nperseg, 1.0 / fs)
+
+        ramp = np.arange(self.nperseg, dtype=np.float64)
+        ramp -= ramp.mean()
+        self.ramp = ramp.astype(dtype)
+        self.ramp_norm = float(np.sum(ramp ** 2))
+
+        # scipy.signal.welch's bias correction for median averaging
+        odd = 2 * np.arange(1, (self.num_segments - 1) // 2 + 1)
+        self.median_bias = 1 + np.sum(1.0 / (odd + 1) - 1.0 / odd)
+
+
+@lru_cache(maxsize=32)
+def welch_plan(num_samples, fs, nperseg=256, noverlap=None, window="hann", dtype="float64"):
+    return WelchPlan(num_samples, fs, nperseg, noverlap, window, np.dtype(dtype))
+
+
+def detrend_segments(segments, detrend, plan):
+    if detrend == "constant":
+        return segments - segments.mean(axis=-1, keepdims=True, dtype=plan.window.dtype)
+    if detrend == "linear":
+        centered = segments - segments.mean(axis=-1, keepdims=True, dtype=plan.window.dtype)
+        slope = (centered @ plan.ramp) / plan.window.dtype.type(plan.ramp_norm)
+        return centered - slope[..., None] * plan.ramp
+    return segments
+
+
+def batched_welch(block, fs, nperseg=256, noverlap=None, window="hann", detrend="constant",
+                  average="mean", workers=-1):
+    # Welch PSD of every row of block (channels along axis 0, samples along
+    # the last axis) in one pass, matching scipy.signal.welch with density
+    # scaling. detrend is "constant", "linear" or "none"; average is "mean"
+    # or "median".
+    #
+    # Segments are strided views of block, so no copy is made before the
+    # detrend; each batch of segments goes through one real FFT call that is
+    # spread over `workers` threads.
+    x = np.asarray(block)
+    dtype = np.result_type(x.dtype, np.float32)
+    plan = welch_plan(x.shape[-1], float(fs), nperseg, noverlap, window, dtype.str)
+
+    segments = sliding_window_view(x, plan.nperseg, axis=-1)[..., ::plan.step, :]
+    segments = segments[..., :plan.num_segments, :]
+    rows = int(np.prod(x.shape[:-1], dtype=np.int64))
+    batch = max(1, BATCH_SAMPLES // max(rows * plan.nperseg, 1))
+
+    total = np.zeros(x.shape[:-1] + (len(plan.freqs),), dtype=dtype)
+    periodograms = []
+    for start in range(0, plan.num_segments, batch):
+        chunk = detrend_segments(segments[..., start:start + batch, :], detrend, plan) * plan.window
+        spectrum = fft.rfft(chunk, axis=-1, workers=workers)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        if average == "median":
+            periodograms.append(power)
+        else:
+            total += power.sum(axis=-2)
+
+    if average == "median":
+        psd = np.median(np.concatenate(periodograms, axis=-2), axis=-2).astype(dtype)
+        psd *= dtype.type(plan.scale / plan.median_bias)
+    else:
+        psd = total * dtype.type(plan.scale / plan.num_segments)
+    return plan.freqs, one_sided(psd, plan)
+
+
+def one_sided(psd, plan):
+    # One-sided spectrum: double everything except DC and, for even nperseg, Nyquist
+    if plan.nperseg % 2:
+        psd[..., 1:] *= 2
+    else:
+        psd[..., 1:-1] *= 2
+    return psd
+
+
+class WelchAccumulator:
+    # Welch PSD (mean averaging, density scaling) of a record that arrives in
+    # blocks, e.g. chunks of a file too large to load or a live feed. Samples
+    # after the start of the next segment are kept between blocks, so
+    # segments straddling a block boundary are counted exactly once, and only
+    # a running sum of periodograms per channel is held. Once every block has
+    # been added the result equals batched_welch / scipy.signal.welch over the
+    # whole record (given at least nperseg samples); psd() can be read at any
+    # time in between.
+    def __init__(self, num_channels, fs, nperseg=256, noverlap=None, window="hann", detrend="constant",
+                 dtype=np.float64, workers=-1):
+        self.plan = welch_plan(nperseg, float(fs), nperseg, noverlap, window, np.dtype(dtype).str)
+        self.detrend = detrend
+        self.workers = workers
+        self.tail = np.zeros((num_channels, 0), dtype=dtype)
+        self.total = np.zeros((num_channels, len(self.plan.freqs)))
+        self.num_segments = 0
+
+    @property
+    def freqs(self):
+        return self.plan.freqs
+
+    def add(self, block):
+        # block is (channels, samples); work is proportional to its length
+        plan = self.plan
+        x = np.concatenate([self.tail, np.asarray(block, dtype=self.tail.dtype)], axis=1)
+        count = max((x.shape[1] - plan.noverlap) // plan.step, 0)
+        if count:
+            segments = sliding_window_view(x, plan.nperseg, axis=-1)[:, ::plan.step][:, :count]
+            batch = max(1, BATCH_SAMPLES // max(x.shape[0] * plan.nperseg, 1))
+            for start in range(0, count, batch):
+                chunk = detrend_segments(segments[:, start:start + batch], self.detrend, plan) * plan.window
+                spectrum = fft.rfft(chunk, axis=-1, workers=self.workers)
+                power = spectrum.real ** 2 + spectrum.imag ** 2
+                self.total += power.sum(axis=1, dtype=np.float64)
+            self.num_segments += count
+        # Keep everything from the start of the next segment
+        self.tail = x[:, count * plan.step:].copy()
+
+    def psd(self):
+        # (freqs, psd) with one row per channel; (None, None) before the
+        # first whole segment
+        if not self.num_segments:
+            return None, None
+        return self.plan.freqs, one_sided(self.total * (self.plan.scale / self.num_segments), self.plan)
+
+
+# Nominal mid-band frequencies of one decade of 1/3-octave bands
+NOMINAL_THIRD_OCTAVES = [1.0, 1.25, 1.6, 2.0, 2.5, 3.15, 4.0, 5.0, 6.3, 8.0]
+
+
+def third_octave_bands(f_low, f_high):
+    # ANSI S1.11 base-10 1/3-octave bands lying within [f_low, f_high]:
+    # (nominal centres, lower edges, upper edges). Exact centres are
+    # 1000 * 10**(n / 10) Hz, with edges a twentieth of a decade either side.
+    f_low = max(f_low, 1e-3)
+    n = np.arange(np.ceil(10 * np.log10(f_low / 1000.0)), np.floor(10 * np.log10(f_high / 1000.0)) + 1).astype(np.int64)
+    centres = 1000.0 * 10.0 ** (n / 10.0)
+    lower = centres * 10.0 ** -0.05
+    upper = centres * 10.0 ** 0.05
+    keep = (lower >= f_low) & (upper <= f_high)
+    nominal = np.array([NOMINAL_THIRD_OCTAVES[k % 10] * 10.0 ** (k // 10 + 3) for k in n[keep]])
+    return nominal, lower[keep], upper[keep]
+
+
+def band_rms(freqs, psd, lower, upper):
+    # RMS within each band [lower, upper] of every row of psd (channels,
+    # freqs), i.e. the square root of the PSD integrated over the band, and
+    # the overall RMS over the whole spectrum. The running trapezoid integral
+    # of all rows is taken once and read at every band edge by linear
+    # interpolation, so all channels and bands come out of a few array
+    # operations. Returns (overall (channels,), bands (channels, bands)).
+    psd = np.atleast_2d(psd)
+    cumulative = cumulative_trapezoid(psd, freqs, axis=-1, initial=0)
+    edges = np.concatenate([lower, upper])
+    position = np.interp(edges, freqs, np.arange(len(freqs), dtype=np.float64))
+    index = np.minimum(position.astype(np.int64), len(freqs) - 2)
+    fraction = position - index
+    at_edges = cumulative[:, index] + fraction * (cumulative[:, index + 1] - cumulative[:, index])
+    bands = at_edges[:, len(lower):] - at_edges[:, :len(lower)]
+    return np.sqrt(cumulative[:, -1]), np.sqrt(np.maximum(bands, 0))
+
+
+class PSDCache:
+    # LRU cache of per-channel PSDs shared by the PSD grid, the zoom view and
+    # re-plots. Entries are keyed by everything that changes the spectrum:
+    # (source, channel, fs, Welch settings, time range, sensitivity)
+    # and evicted least recently used first once max_bytes is exceeded.
+    # Lookups and stores are locked so a prefetch thread can fill it; the
+    # spectra themselves are computed outside the lock.
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def psd(self, source, data, channels, fs, nperseg=256, noverlap=None, window="hann",
+            detrend="constant", average="mean", time_range=None, sensitivity=1.0):
+        # Returns (freqs, psd) with one row per requested channel; channels not
+        # cached yet are computed together in one batched_welch call.
+        # time_range is a (start, stop) sample slice, None for the whole record.
+        channels = list(channels)
+        params = (float(fs), nperseg, window, noverlap, detrend, average, time_range, float(sensitivity))
+        keys = [(source, channel) + params for channel in channels]
+
+        results = {}
+        with self.lock:
+            for key in keys:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    results[key] = self.entries[key]
+            missing = [channel for channel, key in zip(channels, keys) if key not in results]
+            self.hits += len(channels) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            block = data.channels(missing)
+            if time_range is not None:
+                block = block[..., time_range[0]:time_range[1]]
+            freqs, psd = batched_welch(block, fs, nperseg, noverlap, window, detrend, average)
+            if sensitivity != 1.0:
+                psd = psd / psd.dtype.type(sensitivity) ** 2
+            for channel, row in zip(missing, psd):
+                key = (source, channel) + params
+                # Copy so an evicted row does not keep the whole batch alive
+                results[key] = (freqs, row.copy())
+                self.store(key, results[key])
+
+        if not keys:
+            return np.zeros(0), np.zeros((0, 0))
+        return results[keys[0]][0], np.array([results[key][1] for key in keys])
+
+    def store(self, key, value):
+        # The frequency axis is shared between entries, so only rows are counted
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries[key][1].nbytes
+            self.entries[key] = value
+            self.size += value[1].nbytes
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, (freqs, row) = self.entries.popitem(last=False)
+                self.size -= row.nbytes
+
+    def stats(self):
+        return "PSD cache: {} hits, {} misses, {} spectra".format(self.hits, self.misses, len(self.entries))
+
+
+# Columns of one cached spectrogram tile
+TILE_COLUMNS = 64
+
+
+def stft_power(block, fs, plan, detrend, first, last, pool, workers=-1):
+    # One-sided power spectral density of STFT frames [first, last) of every
+    # row of block, averaged over consecutive groups of `pool` frames (the last
+    # group may be shorter). Only the samples under those frames are touched,
+    # in batches of at most BATCH_SAMPLES. Returns (rows, columns, freqs).
+    x = np.asarray(block)
+    dtype = plan.window.dtype
+    samples = x[..., first * plan.step:(last - 1) * plan.step + plan.nperseg]
+    segments = sliding_window_view(samples, plan.nperseg, axis=-1)[..., ::plan.step, :]
+    count = last - first
+    rows = x.shape[0]
+    batch = max(1, BATCH_SAMPLES // max(rows * plan.nperseg, 1) // pool) * pool
+
+    power = np.empty((rows, -(-count // pool), len(plan.freqs)), dtype=dtype)
+    for start in range(0, count, batch):
+        chunk = detrend_segments(segments[..., start:start + batch, :], detrend, plan) * plan.window
+        spectrum = fft.rfft(chunk, axis=-1, workers=workers)
+        frames = spectrum.real ** 2 + spectrum.imag ** 2
+        whole = frames.shape[1] // pool * pool
+        column = start // pool
+        if whole:
+            power[:, column:column + whole // pool] = frames[:, :whole].reshape(rows, -1, pool, len(plan.freqs)).mean(axis=2)
+        if whole < frames.shape[1]:
+            power[:, column + whole // pool] = frames[:, whole:].mean(axis=1)
+
+    power *= dtype.type(plan.scale)
+    return one_sided(power, plan)
+
+
+class SpectrogramCache:
+    # Short-time spectra of every channel, cached in tiles along time. A view
+    # of samples [start, stop) is drawn with about `columns` columns, each
+    # the average of `pool` consecutive STFT frames (pool a power of two), and
+    # a tile holds TILE_COLUMNS columns of one channel at one pool. Panning
+    # reuses the tiles already on screen and zooming back reuses those of the
+    # earlier pool, so only new tiles are computed, all missing channels of a
+    # tile in one batched STFT. Tiles are evicted least recently used first
+    # once max_bytes is exceeded.
+    def __init__(self, max_bytes=128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def spectrogram(self, source, data, channels, fs, start=0, stop=None, columns=512, nperseg=256,
+                    noverlap=None, window="hann", detrend="constant", sensitivity=1.0):
+        # Returns (edges, freqs, power): power is (channels, num_columns, freqs)
+        # and edges the num_columns + 1 column boundaries in samples
+        channels = list(channels)
+        num_samples = data.num_samples
+        stop = num_samples if stop is None else stop
+        dtype = np.result_type(data.dtype, np.float32)
+        plan = welch_plan(num_samples, float(fs), nperseg, noverlap, window, dtype.str)
+
+        # Frames whose centre lies in the window, and the pool that brings
+        # them down to the requested number of columns
+        half = plan.nperseg / 2.0
+        first = min(max(int(np.ceil((start - half) / plan.step)), 0), max(plan.num_segments - 1, 0))
+        last = min(max(int(np.floor((stop - half) / plan.step)) + 1, first + 1), plan.num_segments)
+        if last <= first:
+            return np.zeros(1), plan.freqs, np.zeros((len(channels), 0, len(plan.freqs)), dtype=dtype)
+        pool = 1
+        while (last - first) > pool * columns:
+            pool *= 2
+        column_first = first // pool
+        column_last = -(-last // pool)
+        tiles = range(column_first // TILE_COLUMNS, (column_last - 1) // TILE_COLUMNS + 1)
+
+        params = (float(fs), plan.nperseg, plan.noverlap, window, detrend, float(sensitivity), pool)
+        parts = {channel: [] for channel in channels}
+        for tile in tiles:
+            keys = [(source, channel) + params + (tile,) for channel in channels]
+            found = {}
+            with self.lock:
+                for key in keys:
+                    if key in self.entries:
+                        self.entries.move_to_end(key)
+                        found[key] = self.entries[key]
+                missing = [channel for channel, key in zip(channels, keys) if key not in found]
+                self.hits += len(channels) - len(missing)
+                self.misses += len(missing)
+            if missing:
+                tile_first = tile * TILE_COLUMNS * pool
+                tile_last = min(tile_first + TILE_COLUMNS * pool, plan.num_segments)
+                power = stft_power(data.channels(missing), fs, plan, detrend, tile_first, tile_last, pool)
+                if sensitivity != 1.0:
+                    power /= power.dtype.type(sensitivity) ** 2
+                for channel, rows in zip(missing, power):
+                    key = (source, channel) + params + (tile,)
+                    # Copy so an evicted tile does not keep the whole batch alive
+                    found[key] = rows.copy()
+                    self.store(key, found[key])
+            for channel, key in zip(channels, keys):
+                parts[channel].append(found[key])
+
+        offset = tiles[0] * TILE_COLUMNS
+        power = np.array([np.concatenate(parts[channel])[column_first - offset:column_last - offset] for channel in channels])
+        edges = np.arange(column_first, column_last + 1) * float(pool * plan.step) + (plan.nperseg - plan.step) / 2.0
+        return edges, plan.freqs, power
+
+    def store(self, key, value):
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries[key].nbytes
+            self.entries[key] = value
+            self.size += value.nbytes
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                _, tile = self.entries.popitem(last=False)
+                self.size -= tile.nbytes
+
+    def stats(self):
+        return "Spectrogram cache: {} hits, {} misses, {} tiles".format(self.hits, self.misses, len(self.entries))
@@ -0,0 +1,98 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from scipy.signal import lfilter
+from thumbnails import attach_arrays, share_arrays
+
+# Records with more values than this (channels x samples) are split across
+# worker processes
+POOL_VALUES = 1 << 23
+
+
+def srs_frequencies(f_min, f_max, per_octave=12):
+    # Log-spaced natural frequencies, per_octave points per octave from f_min
+    count = int(np.floor(per_octave * np.log2(f_max / f_min) + 1e-9)) + 1
+    return f_min * 2.0 ** (np.arange(max(count, 1)) / per_octave)
+
+
+def smallwood_coefficients(freqs, fs, q=10.0):
+    # Ramp-invariant recursive filters (Smallwood) giving the absolute
+    # acceleration of a single-degree-of-freedom system with natural
+    # frequency f and quality factor q to a base acceleration, for every f
+    # at once: (b, a), both (len(freqs), 3)
+    omega = 2 * np.pi * np.asarray(freqs, dtype=np.float64)
+    damping = 1.0 / (2.0 * q)
+    decay = np.exp(-damping * omega / fs)
+    phase = omega / fs * np.sqrt(1.0 - damping ** 2)
+    c = decay * np.cos(phase)
+    sp = decay * np.sin(phase) / phase
+    b = np.stack([1.0 - sp, 2.0 * (sp - c), decay ** 2 - sp], axis=1)
+    a = np.stack([np.ones_like(c), -2.0 * c, decay ** 2], axis=1)
+    return b, a
+
+
+def srs_block(block, fs, freqs, q=10.0, chunk=1 << 20):
+    # Positive and negative peak responses, both (channels, freqs) and >= 0,
+    # of every row of block (channels, samples). Each natural frequency is
+    # one recursive filter run over all channels together; the record is
+    # taken a chunk at a time with the filter state carried over, so only
+    # one chunk of responses is held. maximax is the larger of the two.
+    x = np.atleast_2d(block)
+    num_channels, num_samples = x.shape
+    b, a = smallwood_coefficients(freqs, fs, q)
+    positive = np.full((num_channels, len(b)), -np.inf)
+    negative = np.full((num_channels, len(b)), np.inf)
+    state = np.zeros((len(b), num_channels, 2))
+    for start in range(0, num_samples, chunk):
+        values = x[:, start:start + chunk]
+        for i in range(len(b)):
+            response, state[i] = lfilter(b[i], a[i], values, axis=-1, zi=state[i])
+            np.maximum(positive[:, i], response.max(axis=1), out=positive[:, i])
+            np.minimum(negative[:, i], response.min(axis=1), out=negative[:, i])
+    return np.maximum(positive, 0), np.maximum(-negative, 0)
+
+
+def srs_job(job):
+    # Runs in a worker process: SRS of the shared record at some frequencies
+    memory_name, spec, freqs, fs, q = job
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        return srs_block(attach_arrays(memory, spec)["block"], fs, freqs, q)
+    finally:
+        memory.close()
+
+
+class SRSEngine:
+    # Shock response spectra of whole records. Short records are computed
+    # in process; long ones are placed in shared memory once and the
+    # natural frequencies are split across a pool of worker processes.
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or max(1, min(os.cpu_count() or 1, 8))
+        self.pool = None
+
+    def compute(self, block, fs, freqs, q=10.0):
+        # (positive, negative), both (channels, freqs)
+        block = np.atleast_2d(block)
+        freqs = np.asarray(freqs, dtype=np.float64)
+        if block.size < POOL_VALUES or self.max_workers == 1 or len(freqs) < 2:
+            return srs_block(block, fs, freqs, q)
+        if self.pool is None:
+            # Spawned workers do not inherit the Tk process state
+            self.pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        memory, spec = share_arrays({"block": block})
+        try:
+            groups = [group for group in np.array_split(freqs, min(self.max_workers, len(freqs))) if len(group)]
+            futures = [self.pool.submit(srs_job, (memory.name, spec, group, fs, q)) for group in groups]
+            results = [future.result() for future in futures]
+        finally:
+            memory.close()
+            memory.unlink()
+        return (np.concatenate([result[0] for result in results], axis=1),
+                np.concatenate([result[1] for result in results], axis=1))
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
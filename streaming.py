@@ -0,0 +1,205 @@
+import os
+import numpy as np
+import pandas as pd
+from spectral import WelchAccumulator
+
+
+# Files above this size are summarised chunk by chunk instead of being loaded
+STREAM_THRESHOLD = 512 * 1024 * 1024
+
+# Rows parsed per chunk; always a whole number of envelope buckets
+CHUNK_ROWS = 200000
+
+# Approximate number of min/max buckets kept per channel for the G-level view
+ENVELOPE_BUCKETS = 4000
+
+# Welch settings a streamed pass can honour; the PSD is always mean-averaged,
+# since a median needs every periodogram of the record at once
+STREAM_WELCH_PARAMS = ("nperseg", "noverlap", "window", "detrend")
+
+
+class LoadCancelled(Exception):
+    # Raised from a progress callback to abandon a load between chunks
+    pass
+
+
+def should_stream(file_path):
+    return file_path.endswith('.csv') and os.path.getsize(file_path) > STREAM_THRESHOLD
+
+
+def estimate_rows(file_path, sample_lines=1000):
+    # Average line length of the first lines, extrapolated over the file size
+    with open(file_path, "rb") as f:
+        f.readline()
+        head = [f.readline() for _ in range(sample_lines)]
+    head = [line for line in head if line]
+    if not head:
+        return 0
+    line_bytes = sum(len(line) for line in head) / len(head)
+    return int(os.path.getsize(file_path) / line_bytes)
+
+
+class StreamSummary:
+    # Results of a streamed pass over a file that never held the whole record:
+    # per-bucket min/max envelopes, running statistics and the Welch PSD.
+    def __init__(self, columns, psd_params=None):
+        self.columns = list(columns)
+        self.names = self.columns[1:]
+        self.num_channels = len(self.columns) - 1
+        self.num_rows = 0
+        self.t0 = None
+        self.t_end = None
+
+        self.envelope_time = []
+        self.envelope_min = []
+        self.envelope_max = []
+
+        self.total = np.zeros(self.num_channels)
+        self.total_sq = np.zeros(self.num_channels)
+        self.minimum = np.full(self.num_channels, np.inf)
+        self.maximum = np.full(self.num_channels, -np.inf)
+
+        # Created on the first chunk, when fs is known. psd_params are the
+        # PSD settings the spectrum was computed with, fixed for this load.
+        self.welch = None
+        self.psd_params = stream_psd_params(psd_params)
+
+    def mean(self):
+        return self.total / max(self.num_rows, 1)
+
+    def rms(self):
+        return np.sqrt(self.total_sq / max(self.num_rows, 1))
+
+    def std(self):
+        return np.sqrt(np.maximum(self.rms() ** 2 - self.mean() ** 2, 0))
+
+    def envelope(self):
+        # (times, mins, maxs) with mins/maxs shaped (num_channels, num_buckets)
+        return (np.concatenate(self.envelope_time),
+                np.concatenate(self.envelope_min, axis=1),
+                np.concatenate(self.envelope_max, axis=1))
+
+    def psd(self):
+        if self.welch is None:
+            return None, None
+        return self.welch.psd()
+
+    def add_chunk(self, chunk, bucket, fs, dtype=np.float64):
+        # Samples are processed in dtype; running sums stay in float64
+        time_values = chunk.iloc[:, 0].to_numpy(dtype=np.float64)
+        values = chunk.iloc[:, 1:].to_numpy(dtype=dtype)
+
+        if self.t0 is None:
+            self.t0 = time_values[0]
+        self.t_end = time_values[-1]
+        self.num_rows += len(values)
+
+        # Min/max envelope per bucket; only the final chunk can end in a partial bucket
+        edges = np.arange(0, len(values), bucket)
+        self.envelope_time.append(time_values[edges])
+        self.envelope_min.append(np.minimum.reduceat(values, edges, axis=0).T)
+        self.envelope_max.append(np.maximum.reduceat(values, edges, axis=0).T)
+
+        self.total += values.sum(axis=0, dtype=np.float64)
+        self.total_sq += np.square(values, dtype=np.float64).sum(axis=0)
+        self.minimum = np.minimum(self.minimum, values.min(axis=0))
+        self.maximum = np.maximum(self.maximum, values.max(axis=0))
+
+        # Welch segments continue across chunk boundaries, so the PSD is the
+        # same as welch over the whole file
+        if self.welch is None:
+            welch_params = {name: self.psd_params[name] for name in STREAM_WELCH_PARAMS}
+            self.welch = WelchAccumulator(self.num_channels, fs, dtype=dtype, **welch_params)
+        self.welch.add(values.T)
+
+
+def stream_psd_params(psd_params=None):
+    # The PSD settings a streamed pass actually uses: the given ones (PSD tab
+    # keywords, defaults for any missing) with mean averaging
+    params = {"nperseg": 256, "noverlap": None, "window": "hann", "detrend": "constant"}
+    params.update({name: value for name, value in (psd_params or {}).items() if name in STREAM_WELCH_PARAMS})
+    params["average"] = "mean"
+    return params
+
+
+def read_csv_progress(file_path, progress=None, chunk_rows=CHUNK_ROWS, usecols=None):
+    # pd.read_csv in chunks so progress(bytes_read, rows) can be reported
+    chunks = []
+    rows = 0
+    with open(file_path, "rb") as f:
+        for chunk in pd.read_csv(f, chunksize=chunk_rows, usecols=usecols):
+            chunks.append(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(f.tell(), rows)
+    if not chunks:
+        return pd.read_csv(file_path, usecols=usecols)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_xlsx_fast(file_path, progress=None, block_rows=CHUNK_ROWS, usecols=None):
+    # The calamine engine parses workbooks natively and is much faster than
+    # openpyxl but cannot report progress; without it, stream the worksheet
+    # with openpyxl in read-only mode instead of building the full object model.
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        return normalize_time(pd.read_excel(file_path, engine="calamine", usecols=usecols))
+
+    import openpyxl
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        size = os.path.getsize(file_path)
+        total_rows = max((sheet.max_row or 1) - 1, 1)
+        row_iter = sheet.iter_rows(values_only=True)
+        columns = list(next(row_iter))
+        if usecols is not None:
+            columns = [columns[k] for k in usecols]
+        blocks = []
+        rows = []
+        done = 0
+        for row in row_iter:
+            rows.append(row if usecols is None else [row[k] for k in usecols])
+            if len(rows) == block_rows:
+                blocks.append(np.array(rows, dtype=np.float64))
+                done += len(rows)
+                rows = []
+                if progress is not None:
+                    # Byte offsets are not available inside the zip, so report
+                    # the fraction of rows read scaled to the file size
+                    progress(int(size * min(done / total_rows, 1.0)), done)
+        if rows:
+            blocks.append(np.array(rows, dtype=np.float64))
+    finally:
+        workbook.close()
+
+    values = np.vstack(blocks) if blocks else np.empty((0, len(columns)))
+    return normalize_time(pd.DataFrame(values, columns=columns))
+
+
+def normalize_time(data):
+    # Convert time data to seconds if it's in milliseconds
+    if 'Time' in data.columns:
+        if data['Time'].max() > 100:
+            data['Time'] /= 1000  # Convert milliseconds to seconds
+    return data
+
+
+def stream_csv(file_path, fs, chunk_rows=CHUNK_ROWS, psd_params=None, progress=None, dtype=np.float64):
+    # psd_params: PSD tab settings for the Welch accumulator (see stream_psd_params)
+    bucket = max(1, estimate_rows(file_path) // ENVELOPE_BUCKETS)
+    chunk_rows = max(bucket, chunk_rows // bucket * bucket)
+    summary = None
+
+    with open(file_path, "rb") as f:
+        for chunk in pd.read_csv(f, chunksize=chunk_rows):
+            if summary is None:
+                summary = StreamSummary(chunk.columns, psd_params)
+            summary.add_chunk(chunk, bucket, fs, dtype)
+            if progress is not None:
+                progress(f.tell(), summary.num_rows)
+
+    return summary
@@ -0,0 +1,116 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+
+
+def share_arrays(arrays):
+    # Copy a dict of arrays into one shared memory block. Returns the block
+    # and a picklable spec {name: (offset, shape, dtype)} for attach_arrays.
+    spec = {}
+    offset = 0
+    for name, array in arrays.items():
+        spec[name] = (offset, array.shape, array.dtype.str)
+        offset += (array.nbytes + 63) // 64 * 64
+    memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+    views = attach_arrays(memory, spec)
+    for name, array in arrays.items():
+        views[name][...] = array
+    return memory, spec
+
+
+def attach_arrays(memory, spec):
+    return {name: np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=offset)
+            for name, (offset, shape, dtype) in spec.items()}
+
+
+def render_thumbnail(job):
+    # Runs in a worker process: draws one G-level thumbnail offscreen with the
+    # Agg backend from the shared traces and returns (row, RGBA pixels)
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    memory_name, spec, row, title, width, height, dpi = job
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        arrays = attach_arrays(memory, spec)
+        fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(1, 1, 1)
+        ax.plot(arrays["time"][row], arrays["trace"][row], color='blue', linewidth=0.8)
+        if "velocity" in arrays:
+            ax2 = ax.twinx()
+            ax2.plot(arrays["velocity_time"], arrays["velocity"], color='orange', linewidth=0.8)
+            ax2.tick_params(labelsize=6)
+        ax.set_title(title, fontsize=8)
+        ax.tick_params(labelsize=6)
+        fig.subplots_adjust(left=0.18, right=0.82, bottom=0.14, top=0.88)
+        canvas.draw()
+        pixels = np.asarray(canvas.buffer_rgba()).copy()
+    finally:
+        memory.close()
+    return row, pixels
+
+
+class ThumbnailRenderer:
+    # Renders pages of thumbnails in a pool of worker processes. Each page
+    # is one batch: its decimated traces are placed in shared memory once and
+    # every worker draws one channel from it. Results are collected with
+    # poll() so the grid can fill in as workers finish; the shared block is
+    # released when every job of its batch is done or cancelled.
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or max(1, min(os.cpu_count() or 1, 8))
+        self.pool = None
+        self.batches = []
+
+    def start(self, arrays, titles, width, height, dpi):
+        # Queue one batch, cancelling the jobs of older batches not started yet
+        if self.pool is None:
+            # Spawned workers do not inherit the Tk process state
+            self.pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        self.cancel()
+        memory, spec = share_arrays(arrays)
+        futures = [self.pool.submit(render_thumbnail, (memory.name, spec, row, title, width, height, dpi))
+                   for row, title in enumerate(titles)]
+        self.batches.append({"memory": memory, "futures": futures, "collected": set()})
+
+    def cancel(self):
+        # Cancel every job not started yet; True if any was, i.e. the grid
+        # will not be filled in completely
+        cancelled = False
+        for batch in self.batches:
+            for future in batch["futures"]:
+                cancelled = future.cancel() or cancelled
+        return cancelled
+
+    def poll(self):
+        # (row, pixels) for jobs of the newest batch finished since the last
+        # call, and whether that batch still has jobs running
+        results = []
+        for batch in self.batches[:]:
+            current = batch is self.batches[-1]
+            for row, future in enumerate(batch["futures"]):
+                if current and row not in batch["collected"] and future.done() and not future.cancelled():
+                    batch["collected"].add(row)
+                    if future.exception() is None:
+                        results.append(future.result())
+            if all(future.done() for future in batch["futures"]):
+                self.release(batch)
+        pending = bool(self.batches) and not all(future.done() for future in self.batches[-1]["futures"])
+        return results, pending
+
+    def release(self, batch):
+        batch["memory"].close()
+        batch["memory"].unlink()
+        self.batches.remove(batch)
+
+    def shutdown(self):
+        for batch in self.batches[:]:
+            for future in batch["futures"]:
+                future.cancel()
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+        for batch in self.batches[:]:
+            self.release(batch)
@@ -0,0 +1,99 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft
+from spectral import BATCH_SAMPLES, detrend_segments, one_sided, welch_plan
+
+
+def velocity_bin_edges(velocity_values, num_bins):
+    # num_bins equal bins spanning the velocity profile
+    low, high = float(np.min(velocity_values)), float(np.max(velocity_values))
+    if high <= low:
+        high = low + 1.0
+    return np.linspace(low, high, num_bins + 1)
+
+
+def sample_bins(velocity_time, velocity_values, target_time, num_samples, edges, chunk=1 << 20):
+    # Velocity bin of every vibration sample, from the velocity profile
+    # interpolated onto the vibration time base one chunk at a time;
+    # target_time(start, stop) returns those sample times. Samples outside
+    # the velocity record get -1.
+    num_bins = len(edges) - 1
+    bins = np.empty(num_samples, dtype=np.int16 if num_bins < 2 ** 15 else np.int32)
+    for start in range(0, num_samples, chunk):
+        stop = min(start + chunk, num_samples)
+        velocity = np.interp(target_time(start, stop), velocity_time, velocity_values, left=np.nan, right=np.nan)
+        index = np.clip(np.searchsorted(edges, velocity, side="right") - 1, 0, num_bins - 1)
+        index[np.isnan(velocity)] = -1
+        bins[start:stop] = index
+    return bins
+
+
+def binned_levels(block, bins, num_bins, chunk=1 << 20):
+    # RMS and peak |value| of every row of block (channels, samples) within
+    # each velocity bin, plus the samples per bin. The velocity changes
+    # slowly, so each chunk is first reduced over its runs of equal bins
+    # (reduceat) and the runs are then gathered into bins with one bincount
+    # and one maximum.at over all channels. Empty bins are NaN.
+    block = np.atleast_2d(block)
+    num_channels, num_samples = block.shape
+    sum_sq = np.zeros(num_channels * num_bins)
+    peak = np.full(num_channels * num_bins, -np.inf)
+    counts = np.zeros(num_bins, dtype=np.int64)
+    channel_offset = (np.arange(num_channels) * num_bins)[:, None]
+    for start in range(0, num_samples, chunk):
+        values = block[:, start:start + chunk]
+        chunk_bins = bins[start:start + values.shape[1]]
+        starts = np.flatnonzero(np.concatenate([[True], chunk_bins[1:] != chunk_bins[:-1]]))
+        run_bins = chunk_bins[starts].astype(np.int64)
+        valid = run_bins >= 0
+        if not valid.any():
+            continue
+        lengths = np.diff(np.append(starts, values.shape[1]))
+        run_sq = np.add.reduceat(np.square(values, dtype=np.float64), starts, axis=1)[:, valid]
+        run_peak = np.maximum.reduceat(np.abs(values), starts, axis=1)[:, valid]
+        index = (channel_offset + run_bins[valid]).ravel()
+        sum_sq += np.bincount(index, weights=run_sq.ravel(), minlength=sum_sq.size)
+        np.maximum.at(peak, index, run_peak.ravel())
+        counts += np.bincount(run_bins[valid], weights=lengths[valid], minlength=num_bins).astype(np.int64)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rms = np.sqrt(sum_sq.reshape(num_channels, num_bins) / counts)
+    peak = peak.reshape(num_channels, num_bins)
+    peak[:, counts == 0] = np.nan
+    return rms, peak, counts
+
+
+def binned_welch(block, fs, bins, num_bins, nperseg=256, noverlap=None, window="hann", detrend="constant", workers=-1):
+    # Welch PSD (mean averaging, density scaling) of every row of block per
+    # velocity bin: each segment belongs to the bin of its centre sample, and
+    # the periodograms of a batch of segments are summed into their bins for
+    # all channels and frequencies with a single bincount.
+    # Returns (freqs, psd (channels, num_bins, freqs), segments per bin);
+    # bins without a segment are NaN.
+    x = np.atleast_2d(block)
+    num_channels = x.shape[0]
+    dtype = np.result_type(x.dtype, np.float32)
+    plan = welch_plan(x.shape[-1], float(fs), nperseg, noverlap, window, dtype.str)
+    num_freqs = len(plan.freqs)
+
+    segments = sliding_window_view(x, plan.nperseg, axis=-1)[:, ::plan.step][:, :plan.num_segments]
+    segment_bins = bins[plan.starts + plan.nperseg // 2].astype(np.int64)
+    batch = max(1, BATCH_SAMPLES // max(num_channels * plan.nperseg, 1))
+
+    total = np.zeros(num_channels * num_bins * num_freqs)
+    channel_offset = (np.arange(num_channels) * num_bins)[:, None, None]
+    for start in range(0, plan.num_segments, batch):
+        batch_bins = segment_bins[start:start + batch]
+        valid = batch_bins >= 0
+        if not valid.any():
+            continue
+        chunk = detrend_segments(segments[:, start:start + batch][:, valid], detrend, plan) * plan.window
+        spectrum = fft.rfft(chunk, axis=-1, workers=workers)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        index = ((channel_offset + batch_bins[valid][None, :, None]) * num_freqs + np.arange(num_freqs)).ravel()
+        total += np.bincount(index, weights=power.ravel(), minlength=total.size)
+
+    counts = np.bincount(segment_bins[segment_bins >= 0], minlength=num_bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        psd = total.reshape(num_channels, num_bins, num_freqs) * plan.scale / counts[:, None]
+    return plan.freqs, one_sided(psd, plan), counts